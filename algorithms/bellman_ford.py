@@ -1,37 +1,408 @@
-from typing import Dict, Tuple, Any
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any, Union
+import numpy as np
 import networkx as nx
 
-def bellman_ford(graph: nx.DiGraph, source: Any) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+from graphs.array_graph import ArrayGraph, as_array_graph, _gather_ranges
+
+
+class NegativeCycleError(ValueError):
+    """
+    Raised when a negative-weight cycle is reachable from the source.
+
+    Attributes:
+        cycle (List[Any] | None): The cycle as node labels, first node repeated
+            at the end (u0, u1, ..., u0), or None if it could not be recovered.
+    """
+
+    def __init__(self, message: str, cycle: Optional[List[Any]] = None):
+        super().__init__(message)
+        self.cycle = cycle
+
+
+def bellman_ford(graph: Union[nx.DiGraph, ArrayGraph], source: Any, method: str = "vectorized",
+                 workers: Optional[int] = None) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
     """
     Bellman-Ford algorithm to compute shortest paths from a source node.
 
+    Every method returns the same distances and raises the same exception;
+    predecessors may differ only where several shortest paths tie.
+
     Parameters:
-        graph (nx.DiGraph): A directed graph with edge weights.
+        graph (nx.DiGraph | ArrayGraph): A directed graph with edge weights.
         source (Any): The source node.
+        method (str): Relaxation strategy:
+            "classic"         |V|-1 full passes, one Python edge at a time (reference)
+            "vectorized"      NumPy passes over the changed frontier, early termination
+            "spfa"            FIFO queue with subtree disassembly (Tarjan's trick)
+            "goldberg_radzik" passes in topological order of the admissible graph
+            "parallel"        "vectorized" with every pass split over a thread pool
+        workers (int): Threads for "parallel" (default: os.cpu_count()), ignored otherwise
 
     Returns:
         dist (Dict[Any, float]): Shortest distances from the source.
         pred (Dict[Any, Any]): Predecessor of each node in the path.
-        
+
+    Raises:
+        NegativeCycleError: If a negative-weight cycle is detected (a ValueError,
+            the cycle itself is available as ``e.cycle``).
+        ValueError: If ``method`` is unknown.
+    """
+    if method not in _METHODS:
+        raise ValueError(f"Unknown Bellman-Ford method {method!r}, expected one of {sorted(_METHODS)}")
+    ag = as_array_graph(graph) # Missing weights default to 1
+    if method == "parallel":
+        dist, pred = _bellman_ford_parallel(ag, ag.index[source], workers)
+    else:
+        dist, pred = _METHODS[method](ag, ag.index[source])
+    return _to_label_dicts(ag, dist, pred)
+
+
+def super_source_potentials(graph: Union[nx.DiGraph, ArrayGraph]) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+    """
+    Shortest distances from a virtual super-source with a 0-weight edge to every node.
+
+    dist[v] = min(0, min over edges (u, v) of dist[u] + w_uv), the classic
+    potential for feasible duals (Johnson's reweighting). The super-source is
+    implicit: every node starts at distance 0 and in the first frontier, so
+    no node or edges are added. One vectorized, early-terminating pass loop.
+
+    Parameters:
+        graph (nx.DiGraph | ArrayGraph): A directed graph with edge weights.
+
+    Returns:
+        dist (Dict[Any, float]): Potential of every node (<= 0).
+        pred (Dict[Any, Any]): Predecessor of each node, None where the super-source edge is used.
+
     Raises:
-        ValueError: If a negative-weight cycle is detected.
+        NegativeCycleError: If the graph has a negative-weight cycle anywhere.
     """
-    dist = {node: float('inf') for node in graph.nodes}
-    pred = {node: None for node in graph.nodes}
-    dist[source] = 0
+    ag = as_array_graph(graph)
+    dist, pred = _super_source_arrays(ag)
+    return _to_label_dicts(ag, dist, pred)
+
+
+def _super_source_arrays(ag: ArrayGraph) -> Tuple[np.ndarray, np.ndarray]:
+    dist = np.zeros(ag.n, dtype=np.result_type(ag.weights.dtype, np.int64)) # integer weights stay integers
+    pred = np.full(ag.n, -1, dtype=np.int64)
+    bad = _relax_passes(ag, dist, pred, np.arange(ag.n, dtype=np.int64))
+    if bad is not None:
+        raise NegativeCycleError("Graph contains a negative-weight cycle", _extract_cycle(ag, pred.tolist(), bad))
+    return dist, pred
+
+
+def _to_label_dicts(ag: ArrayGraph, dist, pred) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+    labels = ag.nodes
+    if isinstance(pred, np.ndarray):
+        pred = pred.tolist()
+    return ag.to_dict(dist), {labels[v]: (None if u is None or u < 0 else labels[u]) for v, u in enumerate(pred)}
+
+
+def _extract_cycle(ag: ArrayGraph, pred, start: int) -> List[Any]:
+    # Walking |V| predecessors back from a node relaxed in pass |V| always lands on the cycle
+    v = start
+    for _ in range(ag.n):
+        v = pred[v]
+    cycle = [v]
+    u = pred[v]
+    while u != v:
+        cycle.append(u)
+        u = pred[u]
+    cycle.append(v)
+    cycle.reverse()
+    return [ag.nodes[u] for u in cycle]
+
+
+def _find_pred_cycle(ag: ArrayGraph, pred) -> Optional[List[Any]]:
+    # Any cycle in the predecessor graph (a functional graph), or None
+    state = [0] * ag.n # 0 = unseen, 1 = on the current walk, 2 = done
+    for start in range(ag.n):
+        walk = []
+        v = start
+        while v is not None and v >= 0 and state[v] == 0:
+            state[v] = 1
+            walk.append(v)
+            v = pred[v]
+        if v is not None and v >= 0 and state[v] == 1:
+            return _extract_cycle(ag, pred, v)
+        for u in walk:
+            state[u] = 2
+    return None
+
+
+def _bellman_ford_classic(ag: ArrayGraph, s: int) -> Tuple[list, list]:
+    """Reference |V|-1 pass implementation, one Python edge at a time."""
+    n = ag.n
+    edges = list(zip(ag.sources.tolist(), ag.targets.tolist(), ag.weights.tolist()))
+
+    dist = [float('inf')] * n
+    pred = [None] * n
+    dist[s] = 0
 
     # Relax edges repeatedly
-    for _ in range(len(graph.nodes) - 1): # The shortest path between any two nodes in a graph can have at most |V| − 1 edges
-        for u, v, data in graph.edges(data=True):
-            weight = data.get('weight', 1) # Default weight is 1 if not specified
+    for _ in range(n - 1): # The shortest path between any two nodes in a graph can have at most |V| − 1 edges
+        for u, v, weight in edges:
             if dist[u] + weight < dist[v]:
                 dist[v] = dist[u] + weight
                 pred[v] = u
 
     # Check for negative-weight cycles
-    for u, v, data in graph.edges(data=True):
-        weight = data.get('weight', 1) # Default weight is 1 if not specified
+    for u, v, weight in edges:
         if dist[u] + weight < dist[v]:
-            raise ValueError("Graph contains a negative-weight cycle")
+            pred[v] = u
+            raise NegativeCycleError("Graph contains a negative-weight cycle", _extract_cycle(ag, pred, v))
+
+    return dist, pred
+
+
+def _relax_passes(ag: ArrayGraph, dist: np.ndarray, pred: np.ndarray, frontier: np.ndarray) -> Optional[int]:
+    """
+    Jacobi-style vectorized relaxation until no distance changes.
+
+    Each pass only relaxes the out-edges of nodes whose distance changed in the
+    previous pass (the others cannot improve anything). ``dist`` and ``pred``
+    are updated in place.
+
+    Returns:
+        None when the distances converged, otherwise a node improved in pass
+        |V| (so a negative cycle is reachable).
+    """
+    n = ag.n
+    for _ in range(n):
+        edges = ag.out_edge_ids(frontier)
+        if edges.size == 0:
+            return None
+        src = ag.sources[edges]
+        dst = ag.targets[edges]
+        cand = dist[src] + ag.weights[edges]
+        new = dist.copy()
+        np.minimum.at(new, dst, cand)
+        improved = np.flatnonzero(new < dist)
+        if improved.size == 0:
+            return None
+        # Predecessor = first edge attaining the new minimum
+        hit = np.flatnonzero((cand == new[dst]) & (new[dst] < dist[dst]))
+        tgt, first = np.unique(dst[hit], return_index=True)
+        pred[tgt] = src[hit[first]]
+        dist[improved] = new[improved]
+        frontier = improved
+    return int(frontier[0])
+
+
+def _bellman_ford_vectorized(ag: ArrayGraph, s: int) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy engine: all frontier edges relaxed per pass, stops at the first quiet pass."""
+    dist = np.full(ag.n, np.inf)
+    pred = np.full(ag.n, -1, dtype=np.int64)
+    dist[s] = 0
+    bad = _relax_passes(ag, dist, pred, np.array([s], dtype=np.int64))
+    if bad is not None:
+        raise NegativeCycleError("Graph contains a negative-weight cycle", _extract_cycle(ag, pred.tolist(), bad))
+    return dist, pred
+
+
+def _bellman_ford_parallel(ag: ArrayGraph, s: int, workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Same Jacobi passes as "vectorized", each one spread over a thread pool.
+
+    The edges are split by target range (ArrayGraph.target_shards, cached
+    on the graph per worker count). Every pass, each shard relaxes the
+    frontier's out-edges into its own target range of ``new`` and ``pred``
+    while ``dist`` stays read-only; convergence and the negative-cycle check happen once per pass on the
+    whole array. NumPy releases the GIL inside the gathers and arithmetic,
+    so the shards really do run concurrently.
+    """
+    workers = workers or os.cpu_count() or 1
+    n = ag.n
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    dist[s] = 0
+    shards = ag.target_shards(workers) # built on the first call per worker count, then cached on the graph
+    sources, targets, weights = ag.sources, ag.targets, ag.weights
+
+    def relax(shard, frontier, new):
+        edge_ids, offsets = shard
+        edges = edge_ids[_gather_ranges(offsets, frontier)]
+        if edges.size == 0:
+            return
+        src = sources[edges]
+        dst = targets[edges]
+        cand = dist[src] + weights[edges]
+        np.minimum.at(new, dst, cand)
+        hit = np.flatnonzero((cand == new[dst]) & (new[dst] < dist[dst]))
+        tgt, first = np.unique(dst[hit], return_index=True)
+        pred[tgt] = src[hit[first]]
+
+    frontier = np.array([s], dtype=np.int64)
+    with ThreadPoolExecutor(workers) as pool:
+        for _ in range(n):
+            new = dist.copy()
+            list(pool.map(lambda shard: relax(shard, frontier, new), shards))
+            improved = np.flatnonzero(new < dist)
+            if improved.size == 0:
+                return dist, pred
+            dist[improved] = new[improved]
+            frontier = improved
+    raise NegativeCycleError("Graph contains a negative-weight cycle",
+                             _extract_cycle(ag, pred.tolist(), int(frontier[0])))
+
+
+def _bellman_ford_spfa(ag: ArrayGraph, s: int) -> Tuple[list, list]:
+    """
+    FIFO-queue label-correcting search with subtree disassembly.
+
+    When a node's distance drops, its whole subtree in the current shortest
+    path tree is detached and its members leave the queue: their labels are
+    stale and will be corrected through the node again. Relaxing an edge into
+    an ancestor of the scanning node closes a negative cycle.
+    """
+    n = ag.n
+    offsets = ag.offsets.tolist()
+    targets = ag.targets.tolist()
+    weights = ag.weights.tolist()
+
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    children = [set() for _ in range(n)]
+    in_queue = [False] * n
+    dist[s] = 0
+    queue = deque([s])
+    in_queue[s] = True
+    scans = 0
+
+    while queue:
+        u = queue.popleft()
+        if not in_queue[u]:
+            continue # removed by a subtree disassembly
+        in_queue[u] = False
+        scans += 1
+        if scans > n * (len(targets) + 1):
+            raise NegativeCycleError("Graph contains a negative-weight cycle", _find_pred_cycle(ag, pred))
+        du = dist[u]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if du + weights[e] >= dist[v]:
+                continue
+            # Detach the subtree below v
+            subtree = []
+            stack = list(children[v])
+            while stack:
+                d = stack.pop()
+                subtree.append(d)
+                stack.extend(children[d])
+            if u == v or u in subtree:
+                pred[v] = u
+                raise NegativeCycleError("Graph contains a negative-weight cycle", _extract_cycle(ag, pred, u))
+            for d in subtree:
+                children[d].clear()
+                pred[d] = -1
+                in_queue[d] = False
+            children[v].clear()
+            if pred[v] >= 0:
+                children[pred[v]].discard(v)
+            dist[v] = du + weights[e]
+            pred[v] = u
+            children[u].add(v)
+            if not in_queue[v]:
+                in_queue[v] = True
+                queue.append(v)
 
     return dist, pred
+
+
+def _bellman_ford_goldberg_radzik(ag: ArrayGraph, s: int) -> Tuple[list, list]:
+    """
+    Goldberg-Radzik: each pass scans the nodes reachable through admissible
+    edges (reduced cost <= 0) in topological order.
+
+    A DFS back edge closing a cycle of admissible edges with negative total
+    weight is a negative cycle; zero-weight cycles are just skipped.
+    """
+    n = ag.n
+    offsets = ag.offsets.tolist()
+    targets = ag.targets.tolist()
+    weights = ag.weights.tolist()
+
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    dist[s] = 0
+    B = [s]
+    depth = [-1] * n # position of a node on the current DFS path, -1 when off it
+
+    for _ in range(n + 1):
+        # Roots: nodes of B with at least one out-edge of negative reduced cost
+        roots = [u for u in B
+                 if any(dist[u] + weights[e] < dist[targets[e]] for e in range(offsets[u], offsets[u + 1]))]
+        if not roots:
+            return dist, pred
+
+        # DFS over admissible edges, collecting the post-order
+        color = {} # 1 = on the DFS stack, 2 = finished
+        postorder = []
+        for root in roots:
+            if root in color:
+                continue
+            color[root] = 1
+            path = [root]
+            prefix = [0] # prefix[k]: weight of the path from root to path[k]
+            depth[root] = 0
+            work = [offsets[root]]
+            while work:
+                u = path[-1]
+                pos = work[-1]
+                end = offsets[u + 1]
+                descended = False
+                while pos < end:
+                    v = targets[pos]
+                    w = weights[pos]
+                    pos += 1
+                    if dist[u] + w > dist[v]:
+                        continue # not admissible
+                    c = color.get(v)
+                    if c is None:
+                        work[-1] = pos
+                        color[v] = 1
+                        depth[v] = len(path)
+                        path.append(v)
+                        prefix.append(prefix[-1] + w)
+                        work.append(offsets[v])
+                        descended = True
+                        break
+                    if c == 1:
+                        i = depth[v]
+                        if prefix[-1] - prefix[i] + w < 0: # cycle v -> ... -> u -> v, O(1)
+                            cycle = [ag.nodes[x] for x in path[i:]]
+                            cycle.append(ag.nodes[v])
+                            raise NegativeCycleError("Graph contains a negative-weight cycle", cycle)
+                if descended:
+                    continue
+                work.pop()
+                path.pop()
+                prefix.pop()
+                depth[u] = -1
+                color[u] = 2
+                postorder.append(u)
+
+        # Scan in topological order
+        changed = set()
+        for u in reversed(postorder):
+            du = dist[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if du + weights[e] < dist[v]:
+                    dist[v] = du + weights[e]
+                    pred[v] = u
+                    changed.add(v)
+        B = list(changed)
+
+    raise NegativeCycleError("Graph contains a negative-weight cycle", _find_pred_cycle(ag, pred))
+
+
+_METHODS = {
+    "classic": _bellman_ford_classic,
+    "vectorized": _bellman_ford_vectorized,
+    "spfa": _bellman_ford_spfa,
+    "goldberg_radzik": _bellman_ford_goldberg_radzik,
+    "parallel": _bellman_ford_parallel,
+}
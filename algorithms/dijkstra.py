@@ -0,0 +1,101 @@
+import heapq
+from typing import Any, Dict, List, Tuple, Union
+import numpy as np
+import networkx as nx
+
+from graphs.array_graph import ArrayGraph, as_array_graph
+from algorithms.bellman_ford import _to_label_dicts
+
+
+def _reweighted_weights(ag: ArrayGraph, y: np.ndarray) -> np.ndarray:
+    """
+    Edge weights reweighted by feasible duals: w_uv + y[u] - y[v] (all >= 0).
+
+    Raises:
+        ValueError: If some reweighted edge is negative, i.e. ``y`` is not feasible.
+    """
+    red = ag.weights + y[ag.sources] - y[ag.targets]
+    if red.size and red.min() < 0:
+        bad = int(np.argmin(red))
+        u, v = ag.nodes[ag.sources[bad]], ag.nodes[ag.targets[bad]]
+        raise ValueError(f"Duals are not feasible: edge ({u}, {v}) has reduced length {red[bad]}")
+    return red
+
+
+def _dijkstra(offsets: List[int], targets: List[int], weights: List[float], s: int) -> Tuple[list, list]:
+    """
+    Binary-heap Dijkstra from node id ``s`` on CSR lists with non-negative weights.
+
+    Takes plain lists (``ndarray.tolist()``), indexing numpy arrays one
+    element at a time is several times slower in this loop.
+
+    Returns:
+        dist (list): Distance of every node id, inf if unreachable
+        pred (list): Predecessor node id, -1 for the source and unreachable nodes
+    """
+    n = len(offsets) - 1
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    dist[s] = 0
+    heap = [(0, s)]
+    push, pop = heapq.heappush, heapq.heappop
+    while heap:
+        du, u = pop(heap)
+        if du > dist[u]:
+            continue # stale entry, u was settled through a shorter path
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            dv = du + weights[e]
+            if dv < dist[v]:
+                dist[v] = dv
+                pred[v] = u
+                push(heap, (dv, v))
+    return dist, pred
+
+
+class PotentialDijkstra:
+    """
+    Single-source shortest paths with Dijkstra, once feasible duals are known.
+
+    Feasible duals y (e.g. from round_re_duals) make every reweighted edge
+    w_uv + y[u] - y[v] non-negative, and reweighting shifts every s-v path by
+    the same y[s] - y[v]. So each query is an O(E log V) Dijkstra instead of
+    an O(VE) Bellman-Ford. The reweighted CSR lists are built once and reused.
+
+    Usage:
+        y = round_re_duals(G, y_pred)
+        sp = PotentialDijkstra(G, y)
+        dist, pred = sp.shortest_paths(source) # same as bellman_ford(G, source)
+    """
+
+    def __init__(self, G: Union[nx.DiGraph, ArrayGraph], y_feasible: Dict[Any, float]):
+        """
+        Parameters:
+            G (nx.DiGraph | ArrayGraph): Graph with edge weights
+            y_feasible (dict): Feasible dual of every node
+
+        Raises:
+            ValueError: If some edge has a negative reduced length under ``y_feasible``.
+        """
+        self.graph = as_array_graph(G)
+        self.y = self.graph.to_array(y_feasible).astype(np.float64)
+        reweighted = _reweighted_weights(self.graph, self.y)
+        self._csr = (self.graph.offsets.tolist(), self.graph.targets.tolist(), reweighted.tolist())
+        self._y = self.y.tolist()
+
+    def shortest_paths(self, source: Any) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+        """
+        Shortest paths from ``source``, as returned by ``bellman_ford``.
+
+        Returns:
+            dist (Dict[Any, float]): Shortest distances from the source (inf if unreachable)
+            pred (Dict[Any, Any]): Predecessor of each node in the path (None for the
+                source and unreachable nodes)
+        """
+        s = self.graph.index[source]
+        dist, pred = _dijkstra(*self._csr, s)
+        y = self._y
+        ys = y[s]
+        # Undo the reweighting: d(s, v) = d'(s, v) - y[s] + y[v]
+        dist = [d - ys + yv if d != float('inf') else d for d, yv in zip(dist, y)]
+        return _to_label_dicts(self.graph, dist, pred)
@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Union
+import numpy as np
+import networkx as nx
+
+from graphs.array_graph import ArrayGraph, as_array_graph
+from algorithms.dijkstra import _dijkstra, _reweighted_weights
+from utils.rounding import _round_re_duals_arrays
+
+
+def all_pairs_shortest_paths(G: Union[nx.DiGraph, ArrayGraph], y: Optional[Dict[Any, float]] = None,
+                             processes: Optional[int] = None) -> np.ndarray:
+    """
+    Johnson-style all-pairs shortest paths on top of feasible duals.
+
+    Every edge is reweighted to w_uv + y[u] - y[v] >= 0, Dijkstra runs from
+    each source on the reweighted graph, and the distances are mapped back
+    with d(s, v) = d'(s, v) - y[s] + y[v].
+
+    Parameters:
+        G (nx.DiGraph | ArrayGraph): Graph with edge weights
+        y (dict): Feasible duals of every node, e.g. the output of round_re_duals.
+            If None they are computed with the rounding loop starting from 0.
+        processes (int): Worker processes; sources are split across a pool that
+            reads the edge arrays and writes the distance matrix through shared
+            memory. None or 1 runs in-process.
+
+    Returns:
+        dist (np.ndarray): Shape (n, n), ``dist[i, j]`` is the distance from the
+            i-th to the j-th node of ``G.nodes`` (inf if unreachable)
+
+    Raises:
+        ValueError: If ``y`` is not feasible, or on a negative cycle when ``y`` is None.
+    """
+    ag = as_array_graph(G)
+    if y is None:
+        y_arr, _ = _round_re_duals_arrays(ag, np.zeros(ag.n, dtype=ag.weights.dtype), decrement="bulk")
+    else:
+        y_arr = ag.to_array(y)
+    y_arr = y_arr.astype(np.float64)
+    reweighted = _reweighted_weights(ag, y_arr).astype(np.float64)
+
+    n = ag.n
+    if processes is not None and processes > 1 and n > 1:
+        dist = _all_pairs_pool(ag, reweighted, processes)
+    else:
+        offsets, targets, weights = ag.offsets.tolist(), ag.targets.tolist(), reweighted.tolist()
+        dist = np.empty((n, n))
+        for s in range(n):
+            dist[s] = _dijkstra(offsets, targets, weights, s)[0]
+
+    # Undo the reweighting (inf stays inf)
+    dist -= y_arr[:, None]
+    dist += y_arr[None, :]
+    return dist
+
+
+# Per-process state of the all_pairs_shortest_paths workers
+_pool_blocks = []
+_pool_csr = None
+_pool_dist = None
+
+def _attach(name: str, shape, dtype) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name) # the parent owns the block and unlinks it
+    _pool_blocks.append(shm)
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _pool_worker_init(specs: dict):
+    global _pool_csr, _pool_dist
+    offsets = _attach(*specs["offsets"])
+    targets = _attach(*specs["targets"])
+    weights = _attach(*specs["weights"])
+    # Lists once per worker, the Dijkstra loop is much faster on them than on array scalars
+    _pool_csr = (offsets.tolist(), targets.tolist(), weights.tolist())
+    _pool_dist = _attach(*specs["dist"])
+
+def _pool_worker(sources: range) -> int:
+    for s in sources:
+        _pool_dist[s] = _dijkstra(*_pool_csr, s)[0]
+    return len(sources)
+
+def _all_pairs_pool(ag: ArrayGraph, reweighted: np.ndarray, processes: int) -> np.ndarray:
+    n = ag.n
+    arrays = {"offsets": ag.offsets, "targets": ag.targets, "weights": reweighted}
+    blocks = []
+    specs = {}
+    try:
+        for key, arr in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+            blocks.append(shm)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+            specs[key] = (shm.name, arr.shape, arr.dtype)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, n * n * 8))
+        blocks.append(shm)
+        specs["dist"] = (shm.name, (n, n), np.float64)
+
+        # A few chunks per worker so uneven source costs still balance out
+        step = max(1, n // (4 * processes))
+        chunks = [range(i, min(n, i + step)) for i in range(0, n, step)]
+        with ProcessPoolExecutor(processes, initializer=_pool_worker_init, initargs=(specs,)) as pool:
+            list(pool.map(_pool_worker, chunks))
+        return np.ndarray((n, n), dtype=np.float64, buffer=blocks[-1].buf).copy()
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
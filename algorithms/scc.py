@@ -0,0 +1,92 @@
+from typing import Sequence, Tuple
+import numpy as np
+
+from graphs.array_graph import ArrayGraph
+
+
+def tarjan_scc(graph: ArrayGraph) -> Tuple[np.ndarray, int]:
+    """
+    Iterative Tarjan strongly connected components on an array graph.
+
+    Components are numbered in the order Tarjan completes them, which is a
+    reverse topological order of the condensation: every edge between two
+    different components goes from a higher id to a lower id.
+
+    Parameters:
+        graph (ArrayGraph): The graph
+
+    Returns:
+        comp (np.ndarray): Component id of each node id (int32)
+        n_comps (int): Number of components
+    """
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    return tarjan_scc_adjacency([targets[offsets[v]:offsets[v + 1]] for v in range(graph.n)])
+
+
+def tarjan_scc_adjacency(successors: Sequence[Sequence[int]]) -> Tuple[np.ndarray, int]:
+    """
+    Same as ``tarjan_scc`` but on plain adjacency lists.
+
+    Parameters:
+        successors (Sequence[Sequence[int]]): ``successors[v]`` lists the node ids v points to
+
+    Returns:
+        comp (np.ndarray): Component id of each node id (int32)
+        n_comps (int): Number of components
+    """
+    n = len(successors)
+
+    index = [-1] * n
+    low = [0] * n
+    comp = [-1] * n
+    on_stack = [False] * n
+    stack = []
+    counter = 0
+    n_comps = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        # Each frame is (node, position of the next successor to look at)
+        work = [(root, 0)]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            v, pos = work[-1]
+            succ = successors[v]
+            end = len(succ)
+            descended = False
+            while pos < end:
+                w = succ[pos]
+                pos += 1
+                if index[w] == -1:
+                    work[-1] = (v, pos)
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                    descended = True
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    comp[w] = n_comps
+                    if w == v:
+                        break
+                n_comps += 1
+
+    return np.asarray(comp, dtype=np.int32), n_comps
@@ -0,0 +1,300 @@
+# experiments/benchmark.py
+# Run from the repository root: python -m experiments.benchmark --help
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from algorithms.bellman_ford import bellman_ford
+from graphs.array_graph import ArrayGraph
+from graphs.graph_generator import (generate_random_graph, generate_grid_graph, generate_layered_graph,
+                                    generate_planted_potential_graph, noisy_prediction)
+from utils.cache import ResultCache
+from utils.rounding import round_re_duals, round_re_duals_scaled, RPfRELD_experiment_version
+from utils.tracing import RoundingTrace
+
+FAMILIES = ("random", "grid", "layered", "planted")
+KEY_FIELDS = ("family", "n_nodes", "edge_prob", "max_weight", "noise", "solver")
+
+
+@dataclass
+class Instance:
+    """One generated benchmark input: the graph plus the prediction fed to the rounding solvers."""
+    family: str
+    n_nodes: int
+    edge_prob: float
+    max_weight: int
+    noise: int
+    graph: ArrayGraph
+    y_pred: Dict[int, int]
+
+
+def make_instance(family: str, n_nodes: int, edge_prob: float, max_weight: int, noise: int, seed=None) -> Instance:
+    """
+    Generate one graph of ``family`` and a prediction with the given noise level.
+
+    "planted" predictions are the planted duals plus noise; the other families
+    have no known duals, so their predictions are pure noise around 0. Grids
+    and layered graphs are DAGs and use weights in [-W, W]; "random" uses
+    generate_random_graph, which plants a potential to avoid negative cycles
+    (weights stay in [-W, W], negative ones only down to about -W/2).
+
+    Parameters:
+        family (str): One of FAMILIES
+        n_nodes (int): Approximate number of nodes (grids and layers are rounded to fit)
+        edge_prob (float): Edge probability (ignored by "grid")
+        max_weight (int): W, the weight magnitude
+        noise (int): Prediction noise, see graphs.graph_generator.noisy_prediction
+        seed (int | np.random.Generator): Seed or generator
+
+    Returns:
+        Instance: The benchmark input
+    """
+    rng = np.random.default_rng(seed)
+    weight_range = (-max_weight, max_weight)
+    truth = None
+    if family == "random":
+        graph = generate_random_graph(n_nodes, edge_prob, weight_range, seed=rng, as_array=True)
+    elif family == "grid":
+        side = max(1, int(round(math.sqrt(n_nodes))))
+        graph = generate_grid_graph(side, side, weight_range, seed=rng, as_array=True)
+    elif family == "layered":
+        layer_size = max(1, int(round(math.sqrt(n_nodes))))
+        graph = generate_layered_graph(max(1, n_nodes // layer_size), layer_size, edge_prob, weight_range,
+                                       seed=rng, as_array=True)
+    elif family == "planted":
+        graph, truth = generate_planted_potential_graph(n_nodes, edge_prob, cost_range=(0, max_weight),
+                                                        potential_range=(-max_weight, 0), seed=rng, as_array=True)
+    else:
+        raise ValueError(f"Unknown graph family {family!r}, expected one of {FAMILIES}")
+    base = truth if truth is not None else np.zeros(graph.n, dtype=np.int64)
+    y_pred = graph.to_dict(noisy_prediction(base, noise, rng))
+    return Instance(family, graph.n, edge_prob, max_weight, noise, graph, y_pred)
+
+
+def _rounding_solver(**kwargs) -> Callable:
+    def solve(inst: Instance, callback=None):
+        return round_re_duals(inst.graph, inst.y_pred, callback=callback, **kwargs)
+    return solve
+
+
+def _scaled_solver(inst: Instance, callback=None):
+    return round_re_duals_scaled(inst.graph, inst.y_pred)
+
+
+def _rpfreld_solver(inst: Instance, callback=None):
+    return RPfRELD_experiment_version(inst.graph, {}, inst.y_pred)
+
+
+def _bellman_ford_solver(method: str) -> Callable:
+    def solve(inst: Instance, callback=None):
+        bellman_ford(inst.graph, inst.graph.nodes[0], method=method)
+        return None # distances, not duals
+    return solve
+
+
+SOLVERS: Dict[str, Callable] = {
+    "round_re_duals": _rounding_solver(),
+    "round_re_duals_bulk": _rounding_solver(decrement="bulk"),
+    "round_re_duals_scaled": _scaled_solver,
+    "RPfRELD_experiment_version": _rpfreld_solver,
+    "bellman_ford": _bellman_ford_solver("vectorized"),
+    "bellman_ford_spfa": _bellman_ford_solver("spfa"),
+}
+
+
+def _traced_run(inst: Instance, solve: Callable) -> dict:
+    # One run under tracemalloc and a RoundingTrace: the result values of a row
+    trace = RoundingTrace()
+    tracemalloc.start()
+    try:
+        y = solve(inst, callback=trace)
+        values = {"peak_bytes": tracemalloc.get_traced_memory()[1], "iterations": None, "l1_error": None}
+    finally:
+        tracemalloc.stop()
+    if len(trace):
+        values["iterations"] = sum(1 for stats in trace.iterations if stats.n_decremented)
+    if y is not None:
+        values["l1_error"] = float(sum(abs(y[v] - inst.y_pred[v]) for v in inst.y_pred))
+    return values
+
+
+def run_case(inst: Instance, solver: str, repeat: int = 3, warmup: int = 1,
+             cache: Optional[ResultCache] = None) -> dict:
+    """
+    Benchmark one solver on one instance.
+
+    A first traced run measures peak memory (tracemalloc) and counts rounding
+    iterations; then ``warmup`` untimed runs and ``repeat`` timed runs follow.
+    With a ``cache`` only the traced run's values are looked up there, so
+    identical cases seen before (in this sweep or, with a disk tier, an
+    earlier run of the same code; keys include utils.cache.code_fingerprint)
+    skip it. The timed runs always solve, so timings are the
+    same with or without a cache and stay comparable to any baseline.
+
+    Returns:
+        row (dict): Case key plus seconds_min / seconds_median, peak_bytes,
+            iterations, l1_error (||y_pred - y||_1, empty for shortest-path solvers),
+            cache_hits / cache_misses (empty without a cache) and error (message
+            if the solver raised)
+    """
+    solve = SOLVERS[solver]
+    row = {"family": inst.family, "n_nodes": inst.n_nodes, "edge_prob": inst.edge_prob,
+           "max_weight": inst.max_weight, "noise": inst.noise, "solver": solver, "n_edges": inst.graph.m,
+           "seconds_min": None, "seconds_median": None, "peak_bytes": None, "iterations": None,
+           "l1_error": None, "cache_hits": None, "cache_misses": None, "error": ""}
+
+    try:
+        if cache is None:
+            row.update(_traced_run(inst, solve))
+        else:
+            hits, misses = cache.hits, cache.misses
+            key = cache.key(solver, inst.graph, inst.y_pred)
+            row.update(cache.get_or_compute(key, lambda: _traced_run(inst, solve)))
+            row["cache_hits"] = cache.hits - hits
+            row["cache_misses"] = cache.misses - misses
+    except Exception as e: # e.g. ValueError on a negative cycle; keep sweeping
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+
+    for _ in range(warmup):
+        solve(inst)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solve(inst)
+        times.append(time.perf_counter() - start)
+    row["seconds_min"] = min(times)
+    row["seconds_median"] = statistics.median(times)
+    return row
+
+
+def run_benchmark(families: Iterable[str] = FAMILIES, sizes: Iterable[int] = (100, 400),
+                  densities: Iterable[float] = (0.02,), max_weights: Iterable[int] = (10, 100),
+                  noises: Iterable[int] = (0, 5), solvers: Iterable[str] = ("round_re_duals", "round_re_duals_scaled"),
+                  repeat: int = 3, warmup: int = 1, seed: int = 0,
+                  cache: Optional[ResultCache] = None) -> List[dict]:
+    """
+    Sweep graph families, sizes, densities, weight ranges and noise levels.
+
+    Every (family, size, density, W, noise) point gets one instance, shared by all solvers.
+    ``cache`` is passed on to run_case.
+
+    Returns:
+        rows (List[dict]): One row per (instance, solver), see run_case
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for family, n, p, W, noise in itertools.product(families, sizes, densities, max_weights, noises):
+        inst = make_instance(family, n, p, W, noise, rng)
+        for solver in solvers:
+            rows.append(run_case(inst, solver, repeat, warmup, cache))
+    return rows
+
+
+def write_csv(rows: List[dict], path: str):
+    """Write benchmark rows to a CSV file."""
+    fields = list(rows[0]) if rows else list(KEY_FIELDS)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(rows: List[dict], path: str):
+    """Write benchmark rows to a JSON file."""
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
+
+
+def load_rows(path: str) -> List[dict]:
+    """Read rows written by write_csv or write_json."""
+    if path.endswith(".json"):
+        with open(path) as f:
+            return json.load(f)
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _key(row: dict) -> tuple:
+    return tuple(str(row[k]) for k in KEY_FIELDS)
+
+
+def compare_to_baseline(rows: List[dict], baseline: List[dict], threshold: float = 0.1,
+                        metric: str = "seconds_median") -> List[dict]:
+    """
+    Flag cases that got slower than a baseline run.
+
+    Parameters:
+        rows (List[dict]): Current results
+        baseline (List[dict]): Earlier results (e.g. from load_rows)
+        threshold (float): Allowed relative slowdown, 0.1 = 10%
+        metric (str): Column to compare
+
+    Returns:
+        regressions (List[dict]): Case key plus baseline, current and ratio for every
+            case whose metric exceeds baseline * (1 + threshold)
+    """
+    base = {_key(row): row for row in baseline}
+    regressions = []
+    for row in rows:
+        old = base.get(_key(row))
+        if old is None or row.get(metric) in (None, "") or old.get(metric) in (None, ""):
+            continue
+        current, previous = float(row[metric]), float(old[metric])
+        if previous > 0 and current > previous * (1 + threshold):
+            flagged = {k: row[k] for k in KEY_FIELDS}
+            flagged.update({"baseline": previous, "current": current, "ratio": current / previous})
+            regressions.append(flagged)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bellman_ford and the rounding solvers")
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=FAMILIES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 400])
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.02])
+    parser.add_argument("--weights", nargs="+", type=int, default=[10, 100], help="values of W, weights in [-W, W]")
+    parser.add_argument("--noise", nargs="+", type=int, default=[0, 5])
+    parser.add_argument("--solvers", nargs="+", default=["round_re_duals", "round_re_duals_scaled"], choices=list(SOLVERS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark.csv", help="output file, .csv or .json")
+    parser.add_argument("--baseline", help="earlier output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown")
+    parser.add_argument("--cache", action="store_true", help="reuse the traced run of repeated cases from an in-memory result cache (timed runs always solve)")
+    parser.add_argument("--cache-dir", help="also keep cached results on disk, across runs of the same code (implies --cache)")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(disk_dir=args.cache_dir) if args.cache or args.cache_dir else None
+    rows = run_benchmark(args.families, args.sizes, args.densities, args.weights, args.noise,
+                         args.solvers, args.repeat, args.warmup, args.seed, cache)
+    (write_json if args.out.endswith(".json") else write_csv)(rows, args.out)
+    for row in rows:
+        timing = row["error"] or f"{row['seconds_median']:.4f} s"
+        print(f"{row['family']:>8} n={row['n_nodes']:<6} p={row['edge_prob']:<6} W={row['max_weight']:<6} "
+              f"noise={row['noise']:<4} {row['solver']:>28}: {timing}")
+    if cache is not None:
+        print("Result cache:", ", ".join(f"{k}={v}" for k, v in cache.stats().items()))
+
+    if args.baseline:
+        regressions = compare_to_baseline(rows, load_rows(args.baseline), args.threshold)
+        for reg in regressions:
+            print(f"REGRESSION {reg['family']} n={reg['n_nodes']} {reg['solver']}: "
+                  f"{reg['baseline']:.4f} s -> {reg['current']:.4f} s (x{reg['ratio']:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
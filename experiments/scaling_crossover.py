@@ -0,0 +1,53 @@
+# experiments/scaling_crossover.py
+# Run from the repository root: python -m experiments.scaling_crossover
+
+import time
+from typing import Iterable, List
+
+from graphs.array_graph import ArrayGraph
+from graphs.graph_generator import generate_weight_range_sweep
+from utils.rounding import round_re_duals, round_re_duals_scaled
+
+SOLVERS = {
+    "unit": lambda G, y: round_re_duals(G, y),
+    "bulk": lambda G, y: round_re_duals(G, y, decrement="bulk"),
+    "scaled": lambda G, y: round_re_duals_scaled(G, y),
+}
+
+
+def run_scaling_crossover(max_weights: Iterable[int] = (10, 100, 1000, 10000), n_nodes: int = 400,
+                          edge_prob: float = 0.02) -> List[dict]:
+    """
+    Time the plain rounding loop against the scaling driver over a weight_range sweep.
+
+    Every solver starts from zero predictions on the same graph.
+
+    Parameters:
+        max_weights (Iterable[int]): Values of W, graphs use weight_range=(-W, W)
+        n_nodes (int): Number of nodes per graph
+        edge_prob (float): Edge probability per node pair
+
+    Returns:
+        rows (List[dict]): One row per (W, solver) with the wall time in seconds,
+            and the error message if the solver failed (negative cycle, or the
+            iteration limit hit with unit steps at large W)
+    """
+    rows = []
+    for weight_range, G in generate_weight_range_sweep(max_weights, n_nodes, edge_prob):
+        ag = ArrayGraph.from_networkx(G)
+        y_pred = {node: 0 for node in G.nodes}
+        for name, solver in SOLVERS.items():
+            start = time.perf_counter()
+            try:
+                solver(ag, y_pred)
+                error = ""
+            except (ValueError, RuntimeError) as e: # negative cycle, or the loop ran out of iterations
+                error = f"{type(e).__name__}: {e}"
+            rows.append({"W": weight_range[1], "solver": name, "seconds": time.perf_counter() - start, "error": error})
+    return rows
+
+
+if __name__ == "__main__":
+    for row in run_scaling_crossover():
+        status = row["error"] or "ok"
+        print(f"W = {row['W']:>6}  {row['solver']:>6}: {row['seconds']:.3f} s  ({status})")
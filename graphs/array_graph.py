@@ -0,0 +1,277 @@
+import operator
+from collections.abc import Mapping
+import numpy as np
+import networkx as nx
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence
+
+
+class _IdentityIndex(Mapping):
+    """Label -> id map of a graph labelled 0..n-1, answered without a dict entry per node."""
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def __getitem__(self, label) -> int:
+        try:
+            i = operator.index(label)
+        except TypeError:
+            raise KeyError(label) from None
+        if not 0 <= i < self.n:
+            raise KeyError(label)
+        return i
+
+    def __iter__(self):
+        return iter(range(self.n))
+
+    def __len__(self) -> int:
+        return self.n
+
+
+def has_identity_labels(nodes: Sequence[Hashable]) -> bool:
+    """Whether ``nodes`` are exactly 0..n-1 in order (O(1) for a ``range``)."""
+    if isinstance(nodes, range):
+        return nodes.start == 0 and nodes.step == 1
+    return nodes == list(range(len(nodes)))
+
+
+class ArrayGraph:
+    """
+    Compact array-backed directed graph (CSR layout).
+
+    Nodes are renumbered to int32 ids 0..n-1; ``nodes[i]`` holds the original
+    label of id ``i`` and ``index[label]`` maps it back. When the labels are
+    given as ``range(n)`` they are kept as that range and ``index`` is
+    computed on lookup, so no per-node Python objects are created (this is
+    what graphs.storage.load_graph passes for unlabelled graphs). Edges are stored as
+    contiguous ``sources`` / ``targets`` / ``weights`` arrays sorted by source,
+    with ``offsets`` such that the out-edges of node ``i`` are the slice
+    ``offsets[i]:offsets[i + 1]``.
+
+    Attributes:
+        nodes (List[Any] | range): Original node labels, indexed by node id
+        index (Mapping[Any, int]): Node label -> node id
+        offsets (np.ndarray): CSR row offsets, shape (n + 1,)
+        sources (np.ndarray): Edge source ids (int32), shape (m,)
+        targets (np.ndarray): Edge target ids (int32), shape (m,)
+        weights (np.ndarray): Edge weights, shape (m,)
+    """
+
+    def __init__(self, nodes: Sequence[Hashable], offsets: np.ndarray, sources: np.ndarray,
+                 targets: np.ndarray, weights: np.ndarray):
+        if isinstance(nodes, range) and has_identity_labels(nodes):
+            self.nodes = nodes
+            self.index = _IdentityIndex(len(nodes))
+        else:
+            self.nodes = list(nodes)
+            self.index = {label: i for i, label in enumerate(self.nodes)}
+        self.offsets = offsets
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+        self._in_order = None
+        self._in_offsets = None
+        self._target_shards = {} # shard count -> target_shards(k)
+
+    @classmethod
+    def from_edges(cls, nodes: Sequence[Hashable], sources, targets, weights) -> "ArrayGraph":
+        """
+        Build a graph from node labels and edge arrays given as node ids.
+
+        Edges may come in any order; they are stably sorted by source.
+
+        Parameters:
+            nodes (Sequence): Node labels, position = node id
+            sources (array-like): Source node id of each edge
+            targets (array-like): Target node id of each edge
+            weights (array-like): Weight of each edge
+
+        Returns:
+            ArrayGraph: The graph
+        """
+        n = len(nodes)
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        weights = np.asarray(weights)
+        if weights.dtype == object or weights.dtype == bool:
+            weights = weights.astype(np.float64)
+        if sources.size and np.any(sources[1:] < sources[:-1]):
+            order = np.argsort(sources, kind='stable')
+            sources, targets, weights = sources[order], targets[order], weights[order]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+        return cls(nodes, offsets, sources, targets, weights)
+
+    @classmethod
+    def from_networkx(cls, G: nx.DiGraph, weight: str = 'weight', default: float = 1) -> "ArrayGraph":
+        """
+        Convert an ``nx.DiGraph`` into an ArrayGraph.
+
+        Node ids follow ``G.nodes`` order and edges keep ``G.edges`` order,
+        so iterating the arrays visits edges exactly like ``G.edges(data=True)``.
+
+        Parameters:
+            G (nx.DiGraph): Directed graph with edge weights
+            weight (str): Edge attribute holding the weight
+            default (float): Weight used when the attribute is missing
+
+        Returns:
+            ArrayGraph: The converted graph
+        """
+        nodes = list(G.nodes)
+        index = {label: i for i, label in enumerate(nodes)}
+        m = G.number_of_edges()
+        sources = np.empty(m, dtype=np.int32)
+        targets = np.empty(m, dtype=np.int32)
+        weights = []
+        for k, (u, v, w) in enumerate(G.edges(data=weight, default=default)):
+            sources[k] = index[u]
+            targets[k] = index[v]
+            weights.append(w)
+        return cls.from_edges(nodes, sources, targets, np.array(weights) if m else np.zeros(0, dtype=np.int64))
+
+    def to_networkx(self, weight: str = 'weight') -> nx.DiGraph:
+        """
+        Convert back to an ``nx.DiGraph`` with the original node labels.
+
+        Parameters:
+            weight (str): Edge attribute to store the weight under
+
+        Returns:
+            G (nx.DiGraph): The graph
+        """
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodes)
+        labels = self.nodes
+        G.add_weighted_edges_from(
+            ((labels[u], labels[v], w) for u, v, w in
+             zip(self.sources.tolist(), self.targets.tolist(), self.weights.tolist())),
+            weight=weight)
+        return G
+
+    @property
+    def n(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def m(self) -> int:
+        return int(self.sources.shape[0])
+
+    def out_edges(self, i: int) -> slice:
+        """Slice of the edge arrays holding the out-edges of node id ``i``."""
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def edge_labels(self) -> List[tuple]:
+        """Edges as ``(u, v)`` tuples of original labels, in edge-array order."""
+        labels = self.nodes
+        return [(labels[u], labels[v]) for u, v in zip(self.sources.tolist(), self.targets.tolist())]
+
+    def to_array(self, values: Dict[Any, Any], dtype=None) -> np.ndarray:
+        """Turn a dict keyed by node label into an array indexed by node id."""
+        return np.asarray([values[label] for label in self.nodes], dtype=dtype)
+
+    def to_dict(self, values: Iterable) -> Dict[Any, Any]:
+        """Turn an array indexed by node id into a dict keyed by node label."""
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        return dict(zip(self.nodes, values))
+
+    def subgraph_edges(self, mask: np.ndarray, weights: Optional[np.ndarray] = None) -> "ArrayGraph":
+        """
+        Graph on the same nodes keeping only the edges selected by ``mask``.
+
+        Parameters:
+            mask (np.ndarray): Boolean mask over the edge arrays
+            weights (np.ndarray): Optional replacement weights (full length, masked too)
+
+        Returns:
+            ArrayGraph: The edge-induced subgraph
+        """
+        w = self.weights if weights is None else weights
+        return ArrayGraph.from_edges(self.nodes, self.sources[mask], self.targets[mask], w[mask])
+
+    def with_weights(self, weights: np.ndarray) -> "ArrayGraph":
+        """Same nodes and edges with new weights (structure arrays are shared, not copied)."""
+        g = ArrayGraph(self.nodes, self.offsets, self.sources, self.targets, np.asarray(weights))
+        g.index = self.index
+        g._in_order = self._in_order
+        g._in_offsets = self._in_offsets
+        g._target_shards = self._target_shards # shards hold edge ids only, weights don't matter
+        return g
+
+    def in_order(self) -> np.ndarray:
+        """Permutation of the edge arrays that sorts edges by target (cached)."""
+        if self._in_order is None:
+            self._in_order = np.argsort(self.targets, kind='stable')
+            self._in_offsets = np.zeros(self.n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=self.n), out=self._in_offsets[1:])
+        return self._in_order
+
+    def in_offsets(self) -> np.ndarray:
+        """CSR offsets into ``in_order()``: in-edges of node i are ``in_order()[in_offsets()[i]:in_offsets()[i + 1]]``."""
+        self.in_order()
+        return self._in_offsets
+
+    def target_shards(self, k: int) -> List[tuple]:
+        """
+        Split the edges into ``k`` shards by target id, each holding about m / k edges (cached per ``k``).
+
+        A shard is (edge ids sorted by source, CSR offsets over source ids), so
+        the out-edges of a set of sources inside a shard can be gathered like
+        on the graph. Shards own disjoint target ranges. Empty shards are
+        dropped, so fewer than ``k`` may come back.
+        """
+        shards = self._target_shards.get(k)
+        if shards is not None:
+            return shards
+        in_offsets = self.in_offsets()
+        cuts = np.searchsorted(in_offsets, np.linspace(0, self.m, k + 1), side='left')
+        cuts[0], cuts[-1] = 0, self.n
+        shards = []
+        for lo, hi in zip(cuts[:-1], cuts[1:]):
+            edges = self.in_order()[in_offsets[lo]:in_offsets[hi]]
+            if edges.size == 0:
+                continue
+            edges = edges[np.argsort(self.sources[edges], kind='stable')]
+            offsets = np.zeros(self.n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.sources[edges], minlength=self.n), out=offsets[1:])
+            shards.append((edges, offsets))
+        self._target_shards[k] = shards
+        return shards
+
+    def out_edge_ids(self, nodes: np.ndarray) -> np.ndarray:
+        """Edge ids of all out-edges of the given node ids, gathered from the CSR offsets."""
+        return _gather_ranges(self.offsets, np.asarray(nodes, dtype=np.int64))
+
+    def in_edge_ids(self, nodes: np.ndarray) -> np.ndarray:
+        """Edge ids of all in-edges of the given node ids."""
+        return self.in_order()[_gather_ranges(self.in_offsets(), np.asarray(nodes, dtype=np.int64))]
+
+    def __repr__(self):
+        return f"ArrayGraph(n={self.n}, m={self.m})"
+
+
+def _gather_ranges(offsets: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    # Concatenation of arange(offsets[r], offsets[r + 1]) for every r in rows, without a Python loop
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return shift + np.arange(total)
+
+
+def as_array_graph(graph, weight: str = 'weight') -> ArrayGraph:
+    """
+    Return ``graph`` as an ArrayGraph, converting an ``nx.DiGraph`` if needed.
+
+    Parameters:
+        graph (nx.DiGraph | ArrayGraph): The graph
+        weight (str): Edge attribute holding the weight (networkx input only)
+
+    Returns:
+        ArrayGraph: The array-backed graph
+    """
+    if isinstance(graph, ArrayGraph):
+        return graph
+    return ArrayGraph.from_networkx(graph, weight=weight)
@@ -0,0 +1,263 @@
+# graphs/edge_list.py
+
+import io
+import warnings
+from typing import Dict, Iterator, Optional
+import numpy as np
+
+from graphs.array_graph import ArrayGraph
+from graphs.storage import _create
+
+COMMENTS = ("#", "%")
+
+
+def _chunks(path: str, chunk_bytes: int) -> Iterator[bytes]:
+    # Blocks of whole lines, about chunk_bytes each
+    with open(path, "rb") as f:
+        rest = b""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = rest + block
+            cut = block.rfind(b"\n") + 1
+            if cut == 0:
+                rest = block # one line longer than chunk_bytes, keep reading
+                continue
+            rest = block[cut:]
+            yield block[:cut]
+        if rest.strip():
+            yield rest
+
+
+def _strip_comments(chunk: bytes, prefixes) -> bytes:
+    return b"\n".join(line for line in chunk.split(b"\n") if not line.lstrip().startswith(prefixes))
+
+
+def _parse_numeric(chunk: bytes, weighted: bool):
+    # Integer labels: NumPy's C parser. Raises ValueError on anything else.
+    fields = [("u", np.int64), ("v", np.int64)] + ([("w", np.float64)] if weighted else [])
+    # loadtxt only stays in C with a single comment prefix; filter the others by hand when present
+    others = tuple(c.encode() for c in COMMENTS[1:])
+    if any(p in chunk for p in others):
+        chunk = _strip_comments(chunk, others)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning) # a chunk holding only comments
+        table = np.atleast_1d(np.loadtxt(io.BytesIO(chunk), dtype=fields, comments=COMMENTS[0]))
+    ends = np.stack([table["u"], table["v"]], axis=1)
+    return ends, (table["w"] if weighted else None)
+
+
+def _fields_per_line(chunk: bytes) -> np.ndarray:
+    # Whitespace-separated fields on every line of chunk, counted on the raw bytes
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    newline = buf == ord("\n")
+    blank = newline | (buf == ord(" ")) | (buf == ord("\t")) | (buf == ord("\r"))
+    start = ~blank
+    start[1:] &= blank[:-1]
+    line = np.cumsum(newline)
+    return np.bincount(line[start], minlength=int(line[-1]) + 1 if buf.size else 1)
+
+
+def _parse_tokens(chunk: bytes, weighted: bool):
+    # Any labels: whitespace tokens as a bytes array
+    columns = 3 if weighted else 2
+    prefixes = tuple(c.encode() for c in COMMENTS)
+    if any(p in chunk for p in prefixes):
+        chunk = _strip_comments(chunk, prefixes)
+    fields = _fields_per_line(chunk)
+    bad = np.flatnonzero((fields != 0) & (fields != columns))
+    if bad.size:
+        line = chunk.split(b"\n")[bad[0]].decode(errors='replace')
+        raise ValueError(f"Malformed edge list: expected {columns} columns, got line {line!r}")
+    table = np.array(chunk.split(), dtype=bytes).reshape(-1, columns)
+    weights = None
+    if weighted:
+        try:
+            weights = table[:, 2].astype(np.int64)
+        except ValueError:
+            weights = table[:, 2].astype(np.float64)
+    return table[:, :2], weights
+
+
+class _NonIntegerLabels(Exception):
+    """Raised by the numeric pass when some node label is not an integer."""
+
+
+def _diagnose(chunk: bytes, weighted: bool):
+    # The numeric parser rejected chunk: raise _NonIntegerLabels at the first line with a non-integer
+    # label, ValueError at a malformed line before it. Returns if neither is found.
+    columns = 3 if weighted else 2
+    prefixes = tuple(c.encode() for c in COMMENTS)
+    for line in chunk.split(b"\n"):
+        fields = line.split()
+        if not fields or fields[0].startswith(prefixes):
+            continue
+        if len(fields) != columns:
+            raise ValueError(f"Malformed edge list: expected {columns} columns, got line {line.decode(errors='replace')!r}")
+        try:
+            int(fields[0]), int(fields[1])
+        except ValueError:
+            raise _NonIntegerLabels() from None
+
+
+def _first_seen(ends: np.ndarray):
+    # Distinct labels of a chunk in order of first appearance, plus the inverse mapping
+    labels, first, inverse = np.unique(ends.ravel(), return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return labels[order], rank[inverse].reshape(ends.shape)
+
+
+class _IntNodeIds:
+    """Integer label -> node id, as a sorted label array (no Python object per node)."""
+
+    def __init__(self):
+        self.known = np.zeros(0, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return self.known.size
+
+    def __call__(self, ends: np.ndarray) -> np.ndarray:
+        labels, first, inverse = np.unique(ends.ravel(), return_index=True, return_inverse=True)
+        pos = np.searchsorted(self.known, labels) # both sorted, so this is a merge walk
+        found = pos < self.known.size
+        found[found] = self.known[pos[found]] == labels[found]
+        ids = np.empty(labels.size, dtype=np.int64)
+        ids[found] = self.ids[pos[found]]
+        new = np.flatnonzero(~found)
+        # Number the new labels in order of first appearance
+        ids[new[np.argsort(first[new], kind='stable')]] = len(self) + np.arange(new.size)
+        # Insert them where they belong, O(n) per chunk
+        self.known = np.insert(self.known, pos[new], labels[new])
+        self.ids = np.insert(self.ids, pos[new], ids[new])
+        return ids[inverse].reshape(ends.shape)
+
+    def labels(self) -> list:
+        out = np.empty(len(self), dtype=np.int64)
+        out[self.ids] = self.known
+        return out.tolist()
+
+
+class _TokenNodeIds:
+    """Arbitrary label token -> node id, as a dict."""
+
+    def __init__(self):
+        self.index: Dict[bytes, int] = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __call__(self, ends: np.ndarray) -> np.ndarray:
+        labels, local = _first_seen(ends)
+        index = self.index
+        ids = np.fromiter((index.setdefault(label, len(index)) for label in labels.tolist()),
+                          dtype=np.int64, count=labels.size)
+        return ids[local]
+
+    def labels(self) -> list:
+        return [label.decode() for label in self.index]
+
+
+def _scan(path: str, chunk_bytes: int, weighted: bool, numeric: bool):
+    # Pass 1: node ids, out-degrees, edge count and whether the weights are all integers
+    parse = _parse_numeric if numeric else _parse_tokens
+    node_ids = _IntNodeIds() if numeric else _TokenNodeIds()
+    degree = np.zeros(1024, dtype=np.int64)
+    m = 0
+    integral = True
+    for chunk in _chunks(path, chunk_bytes):
+        try:
+            ends, w = parse(chunk, weighted)
+        except ValueError:
+            if numeric:
+                _diagnose(chunk, weighted)
+            raise
+        src = node_ids(ends)[:, 0]
+        n = len(node_ids)
+        if n > degree.size:
+            degree = np.concatenate([degree, np.zeros(max(degree.size, n - degree.size), dtype=np.int64)])
+        degree[:n] += np.bincount(src, minlength=n)
+        m += src.size
+        if weighted and integral:
+            integral = np.issubdtype(w.dtype, np.integer) or bool(np.all(w == np.floor(w)))
+    return node_ids, degree[:len(node_ids)], m, integral
+
+
+def load_edge_list(path: str, chunk_bytes: int = 64 * 2**20, weighted: bool = True,
+                   out_path: Optional[str] = None, as_networkx: bool = False,
+                   max_networkx_edges: int = 1_000_000):
+    """
+    Stream a ``u v w`` text edge list into an ArrayGraph without networkx.
+
+    The file is parsed in blocks of about ``chunk_bytes`` with NumPy (its C
+    parser when all labels are integers), and node ids are assigned on the
+    fly in order of first appearance. Two passes keep memory bounded: the
+    first counts edges per source and settles the node ids and weight type;
+    the second writes every edge straight into its CSR slot. Besides the
+    final arrays only one chunk and the label table are held at a time.
+    Edges keep file order within each source, like ``ArrayGraph.from_edges``.
+    Lines starting with ``#`` or ``%`` are skipped.
+
+    Parameters:
+        path (str): Edge list, one edge per line
+        chunk_bytes (int): Approximate size of one parsed block
+        weighted (bool): Whether lines have a third weight column; without it weights are 1
+        out_path (str): Optional graphs.storage file to build the arrays in, so
+            the graph can exceed memory; the result is then backed by that file
+        as_networkx (bool): Return an ``nx.DiGraph`` instead (small graphs only)
+        max_networkx_edges (int): Largest edge count accepted with ``as_networkx``
+
+    Returns:
+        ArrayGraph | nx.DiGraph: The graph. Labels are ints if every label is
+            an integer, strings otherwise; weights are int64 if every weight is
+            integral, float64 otherwise.
+
+    Raises:
+        ValueError: On a malformed line, or if ``as_networkx`` is set for a graph
+            with more than ``max_networkx_edges`` edges.
+    """
+    numeric = True
+    try:
+        node_ids, degree, m, integral = _scan(path, chunk_bytes, weighted, numeric)
+    except _NonIntegerLabels:
+        numeric = False
+        node_ids, degree, m, integral = _scan(path, chunk_bytes, weighted, numeric)
+    n = len(node_ids)
+    if as_networkx and m > max_networkx_edges:
+        raise ValueError(f"{m} edges is too many for an nx.DiGraph (max_networkx_edges={max_networkx_edges})")
+
+    nodes = node_ids.labels()
+    weight_dtype = np.int64 if integral else np.float64
+    layout = {"offsets": (np.int64, (n + 1,)), "sources": (np.int32, (m,)),
+              "targets": (np.int32, (m,)), "weights": (weight_dtype, (m,))}
+    if out_path is not None:
+        arrays = _create(out_path, nodes, m, layout)
+    else:
+        arrays = {name: np.empty(shape, dtype=dtype) for name, (dtype, shape) in layout.items()}
+    offsets, sources, targets, weights = (arrays[k] for k in ("offsets", "sources", "targets", "weights"))
+    offsets[0] = 0
+    np.cumsum(degree, out=offsets[1:])
+
+    # Pass 2: place every edge at the next free slot of its source
+    parse = _parse_numeric if numeric else _parse_tokens
+    cursor = offsets[:-1].copy()
+    for chunk in _chunks(path, chunk_bytes):
+        ends, w = parse(chunk, weighted)
+        ids = node_ids(ends)
+        order = np.argsort(ids[:, 0], kind='stable')
+        src = ids[order, 0]
+        heads, first, counts = np.unique(src, return_index=True, return_counts=True)
+        pos = cursor[src] + np.arange(src.size) - np.repeat(first, counts) # next slot + rank within the run
+        sources[pos] = src
+        targets[pos] = ids[order, 1]
+        weights[pos] = w[order] if weighted else 1
+        cursor[heads] += counts
+
+    for arr in arrays.values():
+        if isinstance(arr, np.memmap):
+            arr.flush()
+    graph = ArrayGraph(nodes, offsets, sources, targets, weights)
+    return graph.to_networkx() if as_networkx else graph
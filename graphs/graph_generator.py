@@ -1,5 +1,7 @@
 import networkx as nx
-import random
+import numpy as np
+
+from graphs.array_graph import ArrayGraph
 
 def create_simple_graph():
     """
@@ -51,7 +53,48 @@ def create_layered_toy_graph():
     return G
 
 
-def generate_random_graph(n_nodes: int = 400, edge_prob: float = 0.1, weight_range=(-10, 10), allow_negative_cycles=False) -> nx.DiGraph:
+def _sample_distinct(rng: np.random.Generator, population: int, k: int) -> np.ndarray:
+    # k distinct integers drawn uniformly from [0, population), sorted
+    if k > population // 2:
+        # Dense case: draw the positions to leave out instead
+        excluded = _sample_distinct(rng, population, population - k)
+        return np.setdiff1d(np.arange(population, dtype=np.int64), excluded, assume_unique=True)
+    picked = np.unique(rng.integers(0, population, size=k, dtype=np.int64))
+    while picked.size < k:
+        extra = rng.integers(0, population, size=k - picked.size, dtype=np.int64)
+        picked = np.unique(np.concatenate([picked, extra]))
+    return picked
+
+def generate_random_array_graph(n_nodes: int = 400, edge_prob: float = 0.1, weight_range=(-10, 10),
+                                seed=None) -> ArrayGraph:
+    """
+    Vectorized G(n, p) directed graph in array (CSR) form, no self-loops.
+
+    The edge count is drawn from Binomial(n(n-1), p) and the edge positions
+    are then sampled directly, so the cost is O(m log m) instead of O(n^2).
+
+    Parameters:
+        n_nodes (int): Number of nodes in the graph
+        edge_prob (float): Probability that an edge exists between any pair
+        weight_range (tuple): Range of integer weights (inclusive)
+        seed (int | np.random.Generator): Seed or generator for reproducible graphs
+
+    Returns:
+        G (ArrayGraph): Generated graph, node labels 0..n_nodes-1
+    """
+    rng = np.random.default_rng(seed)
+    pairs = n_nodes * (n_nodes - 1)
+    m = int(rng.binomial(pairs, edge_prob)) if pairs else 0
+    # Position q encodes the pair (u, v): u = q // (n-1), v skips u itself
+    pos = _sample_distinct(rng, pairs, m)
+    u = pos // max(n_nodes - 1, 1)
+    r = pos % max(n_nodes - 1, 1)
+    v = r + (r >= u)
+    weights = rng.integers(weight_range[0], weight_range[1] + 1, size=m, dtype=np.int64)
+    return ArrayGraph.from_edges(range(n_nodes), u, v, weights)
+
+def generate_random_graph(n_nodes: int = 400, edge_prob: float = 0.1, weight_range=(-10, 10), allow_negative_cycles=False,
+                          seed=None, as_array: bool = False):
     """
     Generate a random directed graph with optional negative weights.
 
@@ -59,31 +102,125 @@ def generate_random_graph(n_nodes: int = 400, edge_prob: float = 0.1, weight_ran
         n_nodes (int): Number of nodes in the graph
         edge_prob (float): Probability that an edge exists between any pair
         weight_range (tuple): Range of weights (inclusive)
-        allow_negative_cycles (bool): Whether to allow negative-weight cycles
+        allow_negative_cycles (bool): Whether to allow negative-weight cycles. If False
+            and weight_range has negative weights, the graph is drawn with
+            generate_planted_potential_graph: potentials span D = min(-lo, ceil(hi / 2))
+            and costs lie in [0, hi - D], so weights stay in [-D, hi] (inside
+            weight_range) and no negative cycle exists
+        seed (int | np.random.Generator): Seed or generator for reproducible graphs
+        as_array (bool): Return the ArrayGraph instead of converting to networkx
 
     Returns:
-        G (nx.DiGraph): Generated graph
+        G (nx.DiGraph | ArrayGraph): Generated graph
+
+    Raises:
+        ValueError: If all weights are negative and negative cycles are not allowed.
     """
-    G = nx.DiGraph()
-    G.add_nodes_from(range(n_nodes))
-
-    for u in range(n_nodes):
-        for v in range(n_nodes):
-            if u != v and random.random() < edge_prob: 
-                weight = random.randint(*weight_range) # The * operator unpacks the tuple
-                G.add_edge(u, v, weight=weight)
-
-    if not allow_negative_cycles:
-        # Remove negative cycles by breaking strongly connected components with negative total weight
-        try:
-            nx.find_cycle(G)  # will throw if no cycle
-            # optional: implement a proper cycle removal method
-        except nx.exception.NetworkXNoCycle:
-            pass  # all good
+    lo, hi = weight_range
+    if allow_negative_cycles or lo >= 0:
+        graph = generate_random_array_graph(n_nodes, edge_prob, weight_range, seed)
+    else:
+        if hi < 0:
+            raise ValueError("weight_range has only negative weights, every cycle would be negative")
+        # Plant a hidden potential so no negative cycle can exist; w = c - p[u] + p[v] lies in [-span, hi]
+        span = min(-lo, (hi + 1) // 2)
+        graph, _ = generate_planted_potential_graph(n_nodes, edge_prob, cost_range=(0, hi - span),
+                                                    potential_range=(-span, 0), seed=seed, as_array=True)
+    return graph if as_array else graph.to_networkx()
 
-    return G
+def generate_planted_potential_graph(n_nodes: int = 400, edge_prob: float = 0.1, cost_range=(0, 10),
+                                     potential_range=(-10, 0), seed=None, as_array: bool = False):
+    """
+    Random graph with negative weights but, by construction, no negative cycle.
+
+    Draws a hidden potential p and non-negative costs c, and sets
+    w_uv = c_uv - p[u] + p[v]. Then w_uv + p[u] - p[v] = c_uv >= 0, so p is
+    a feasible dual vector (and every cycle weighs sum(c) >= 0). Linear time.
+
+    Parameters:
+        n_nodes (int): Number of nodes in the graph
+        edge_prob (float): Probability that an edge exists between any pair
+        cost_range (tuple): Range of the integer costs c (inclusive, must be >= 0)
+        potential_range (tuple): Range of the integer potentials p (inclusive)
+        seed (int | np.random.Generator): Seed or generator for reproducible graphs
+        as_array (bool): Return the ArrayGraph instead of converting to networkx
+
+    Returns:
+        G (nx.DiGraph | ArrayGraph): Generated graph, weights in
+            [cost_lo - (p_hi - p_lo), cost_hi + (p_hi - p_lo)]
+        p (np.ndarray): The planted feasible duals, indexed by node (labels are 0..n_nodes-1)
+    """
+    if cost_range[0] < 0:
+        raise ValueError("cost_range must be non-negative to rule out negative cycles")
+    rng = np.random.default_rng(seed)
+    graph = generate_random_array_graph(n_nodes, edge_prob, cost_range, rng)
+    p = rng.integers(potential_range[0], potential_range[1] + 1, size=n_nodes, dtype=np.int64)
+    graph = graph.with_weights(graph.weights - p[graph.sources] + p[graph.targets])
+    return (graph if as_array else graph.to_networkx()), p
+
+def noisy_prediction(p, noise: int, seed=None) -> np.ndarray:
+    """
+    Perturb planted duals to simulate a prediction of a given quality.
+
+    Parameters:
+        p (array-like): Ground-truth duals, e.g. from generate_planted_potential_graph
+        noise (int): Each entry moves by an integer drawn uniformly from [-noise, noise]
+        seed (int | np.random.Generator): Seed or generator
+
+    Returns:
+        y_pred (np.ndarray): Noisy prediction, same shape as p
+    """
+    rng = np.random.default_rng(seed)
+    p = np.asarray(p)
+    return p + rng.integers(-noise, noise + 1, size=p.shape, dtype=np.int64)
+
+def generate_weight_range_sweep(max_weights=(10, 100, 1000, 10000), n_nodes: int = 400, edge_prob: float = 0.1,
+                                allow_negative_cycles=False, seed=None):
+    """
+    Random graphs of the same shape with growing weight magnitudes.
 
-def generate_grid_graph(rows: int, cols: int, weight_range=(1, 10)) -> nx.DiGraph:
+    Parameters:
+        max_weights (Iterable[int]): Values of W, each graph uses weight_range=(-W, W)
+        n_nodes (int): Number of nodes in each graph
+        edge_prob (float): Probability that an edge exists between any pair
+        allow_negative_cycles (bool): Passed to generate_random_graph
+        seed (int | np.random.Generator): Seed or generator shared by the whole sweep
+
+    Yields:
+        (weight_range, G): The weight range used and the generated graph
+    """
+    rng = np.random.default_rng(seed)
+    for W in max_weights:
+        weight_range = (-W, W)
+        yield weight_range, generate_random_graph(n_nodes, edge_prob, weight_range, allow_negative_cycles, seed=rng)
+
+def generate_grid_array_graph(rows: int, cols: int, weight_range=(1, 10), seed=None) -> ArrayGraph:
+    """
+    Vectorized 2D grid graph with directional edges (right and down), in array form.
+
+    Node i * cols + j is the cell (i, j); each node lists its right edge before its down edge.
+
+    Parameters:
+        rows (int): Number of rows
+        cols (int): Number of columns
+        weight_range (tuple): Range of integer weights for edges (inclusive)
+        seed (int | np.random.Generator): Seed or generator for reproducible graphs
+
+    Returns:
+        G (ArrayGraph): Directed grid graph
+    """
+    rng = np.random.default_rng(seed)
+    nodes = np.arange(rows * cols, dtype=np.int64)
+    right = nodes[nodes % cols < cols - 1]
+    down = nodes[nodes < (rows - 1) * cols]
+    sources = np.concatenate([right, down])
+    targets = np.concatenate([right + 1, down + cols])
+    order = np.argsort(sources, kind='stable')
+    sources, targets = sources[order], targets[order]
+    weights = rng.integers(weight_range[0], weight_range[1] + 1, size=sources.size, dtype=np.int64)
+    return ArrayGraph.from_edges(range(rows * cols), sources, targets, weights)
+
+def generate_grid_graph(rows: int, cols: int, weight_range=(1, 10), seed=None, as_array: bool = False):
     """
     Generate a 2D grid graph with directional edges (right and down).
 
@@ -91,16 +228,42 @@ def generate_grid_graph(rows: int, cols: int, weight_range=(1, 10)) -> nx.DiGrap
         rows (int): Number of rows
         cols (int): Number of columns
         weight_range (tuple): Range of weights for edges
+        seed (int | np.random.Generator): Seed or generator for reproducible graphs
+        as_array (bool): Return the ArrayGraph instead of converting to networkx
 
     Returns:
-        G (nx.DiGraph): Directed grid graph
+        G (nx.DiGraph | ArrayGraph): Directed grid graph
     """
-    G = nx.DiGraph()
-    for i in range(rows):
-        for j in range(cols):
-            node = i * cols + j
-            if j < cols - 1:
-                G.add_edge(node, node + 1, weight=random.randint(*weight_range))
-            if i < rows - 1:
-                G.add_edge(node, node + cols, weight=random.randint(*weight_range))
-    return G
+    graph = generate_grid_array_graph(rows, cols, weight_range, seed)
+    return graph if as_array else graph.to_networkx()
+
+def generate_layered_graph(n_layers: int = 10, layer_size: int = 40, edge_prob: float = 0.1, weight_range=(-10, 10),
+                           seed=None, as_array: bool = False):
+    """
+    Random layered DAG: edges only go from layer i to layer i + 1.
+
+    Node i * layer_size + k is the k-th node of layer i. Being acyclic, any
+    weight range is safe (no negative cycles).
+
+    Parameters:
+        n_layers (int): Number of layers
+        layer_size (int): Nodes per layer
+        edge_prob (float): Probability of each edge between consecutive layers
+        weight_range (tuple): Range of integer weights (inclusive)
+        seed (int | np.random.Generator): Seed or generator for reproducible graphs
+        as_array (bool): Return the ArrayGraph instead of converting to networkx
+
+    Returns:
+        G (nx.DiGraph | ArrayGraph): Layered graph
+    """
+    rng = np.random.default_rng(seed)
+    block = layer_size * layer_size
+    pairs = max(n_layers - 1, 0) * block
+    m = int(rng.binomial(pairs, edge_prob)) if pairs else 0
+    pos = _sample_distinct(rng, pairs, m)
+    layer, r = pos // block, pos % block
+    sources = layer * layer_size + r // layer_size
+    targets = (layer + 1) * layer_size + r % layer_size
+    weights = rng.integers(weight_range[0], weight_range[1] + 1, size=m, dtype=np.int64)
+    graph = ArrayGraph.from_edges(range(n_layers * layer_size), sources, targets, weights)
+    return graph if as_array else graph.to_networkx()
@@ -0,0 +1,213 @@
+# graphs/storage.py
+#
+# Binary on-disk format for ArrayGraph, loaded through numpy.memmap.
+#
+# Layout (little-endian):
+#   8 bytes   MAGIC
+#   8 bytes   uint64 length of the JSON header
+#   ...       JSON header: n, m, node labels (null = 0..n-1) and, for every
+#             array, its dtype, shape and byte offset from the data start
+#   padding   up to a multiple of ALIGN, the data section starts here
+#   arrays    offsets, sources, targets, weights, then optional duals and
+#             predictions, each starting on an ALIGN boundary
+#
+# The arrays are raw C-order buffers, so loading maps them without copying:
+# processes that load the same file share the pages through the OS cache.
+
+import json
+from typing import Any, Dict, Optional, Tuple, Union
+import numpy as np
+import networkx as nx
+
+from graphs.array_graph import ArrayGraph, as_array_graph, has_identity_labels
+
+MAGIC = b"AGRAPH\x00\x01"
+ALIGN = 64
+FORMAT_VERSION = 1
+
+
+def _aligned(pos: int) -> int:
+    return -(-pos // ALIGN) * ALIGN
+
+
+def _node_values(ag: ArrayGraph, values) -> np.ndarray:
+    # Dict keyed by label -> array by node id; arrays (1-D, or 2-D with one row per sample) pass through
+    arr = ag.to_array(values) if isinstance(values, dict) else np.asarray(values)
+    if arr.ndim not in (1, 2) or arr.shape[-1] != ag.n:
+        raise ValueError(f"Expected {ag.n} values per node vector, got shape {arr.shape}")
+    return np.ascontiguousarray(arr)
+
+
+def _labels_to_json(nodes: list) -> Optional[list]:
+    if has_identity_labels(nodes):
+        return None
+    for label in nodes:
+        if not isinstance(label, (int, str, tuple)):
+            raise ValueError(f"Cannot store node label {label!r}, only int, str and tuple labels are supported")
+    return nodes
+
+
+def _labels_from_json(labels: Optional[list], n: int):
+    if labels is None:
+        return range(n)
+    # JSON turns tuples (e.g. grid coordinates) into lists
+    return [tuple(label) if isinstance(label, list) else label for label in labels]
+
+
+def save_graph(path: str, G: Union[nx.DiGraph, ArrayGraph], duals=None, predictions=None):
+    """
+    Write a graph, and optionally duals and predictions, to ``path``.
+
+    Parameters:
+        path (str): Output file
+        G (nx.DiGraph | ArrayGraph): The graph
+        duals (dict | array-like): Optional duals, dict by label or array by node id
+        predictions (dict | array-like): Optional predictions, dict by label, array by
+            node id, or a (samples, n) matrix for round_re_duals_batch
+    """
+    ag = as_array_graph(G)
+    arrays = {
+        "offsets": np.ascontiguousarray(ag.offsets, dtype=np.int64),
+        "sources": np.ascontiguousarray(ag.sources, dtype=np.int32),
+        "targets": np.ascontiguousarray(ag.targets, dtype=np.int32),
+        "weights": np.ascontiguousarray(ag.weights),
+    }
+    if duals is not None:
+        arrays["duals"] = _node_values(ag, duals)
+    if predictions is not None:
+        arrays["predictions"] = _node_values(ag, predictions)
+
+    out = _create(path, ag.nodes, ag.m, {name: (arr.dtype, arr.shape) for name, arr in arrays.items()})
+    for name, arr in arrays.items():
+        out[name][...] = arr
+        if isinstance(out[name], np.memmap):
+            out[name].flush()
+
+
+def _create(path: str, nodes: list, m: int, layout: Dict[str, tuple]) -> Dict[str, np.ndarray]:
+    """
+    Write the header of a new file sized for the given arrays and map them for writing.
+
+    Parameters:
+        path (str): Output file
+        nodes (list): Node labels
+        m (int): Number of edges
+        layout (Dict[str, tuple]): Array name -> (dtype, shape), in file order
+
+    Returns:
+        Dict[str, np.ndarray]: Writable memmap per array (plain empty arrays for 0-size ones)
+    """
+    specs = {}
+    pos = 0
+    for name, (dtype, shape) in layout.items():
+        dtype = np.dtype(dtype)
+        specs[name] = {"dtype": dtype.str, "shape": list(shape), "offset": pos}
+        pos = _aligned(pos + dtype.itemsize * int(np.prod(shape)))
+    header = json.dumps({"version": FORMAT_VERSION, "n": len(nodes), "m": m,
+                         "labels": _labels_to_json(nodes), "arrays": specs}).encode()
+
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        f.truncate(data_start + pos) # zero-filled, sparse where the filesystem allows
+    return _map_arrays(path, specs, data_start, "r+")
+
+
+def _map_arrays(path: str, specs: Dict[str, dict], data_start: int, mode: str) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for name, spec in specs.items():
+        shape = tuple(spec["shape"])
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.zeros(shape, dtype=spec["dtype"]) # mmap cannot map 0 bytes
+            arrays[name].flags.writeable = mode != "r"
+        else:
+            arrays[name] = np.memmap(path, dtype=spec["dtype"], mode=mode,
+                                     offset=data_start + spec["offset"], shape=shape)
+    return arrays
+
+
+def read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Read the JSON header of a stored graph.
+
+    Returns:
+        header (dict): n, m, labels and the array specs
+        data_start (int): Byte offset of the data section
+
+    Raises:
+        ValueError: If the file is not in this format.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a stored ArrayGraph")
+        length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(length))
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {header['version']} in {path}")
+    return header, _aligned(len(MAGIC) + 8 + length)
+
+
+def load_graph(path: str, mmap_mode: str = "r") -> Tuple[ArrayGraph, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Map a stored graph into memory without copying its arrays.
+
+    The default read-only mode lets any number of processes share one
+    instance; the solvers never write to the edge arrays. Only stored node
+    labels (and their index dict) are materialized per process; graphs
+    labelled 0..n-1 get a lazy ``range`` instead.
+
+    Parameters:
+        path (str): File written by save_graph
+        mmap_mode (str): numpy.memmap mode, "r" (read-only), "r+" or "c" (copy-on-write)
+
+    Returns:
+        graph (ArrayGraph): The graph, backed by memmaps
+        duals (np.ndarray): Stored duals by node id, or None
+        predictions (np.ndarray): Stored predictions, or None
+    """
+    header, data_start = read_header(path)
+    arrays = _map_arrays(path, header["arrays"], data_start, mmap_mode)
+    nodes = _labels_from_json(header["labels"], header["n"])
+    graph = ArrayGraph(nodes, arrays["offsets"], arrays["sources"], arrays["targets"], arrays["weights"])
+    return graph, arrays.get("duals"), arrays.get("predictions")
+
+
+def load_networkx(path: str, weight: str = "weight") -> nx.DiGraph:
+    """Load a stored graph as an ``nx.DiGraph`` (small graphs only)."""
+    return load_graph(path)[0].to_networkx(weight=weight)
+
+
+def write_edge_list(G: Union[nx.DiGraph, ArrayGraph], path: str):
+    """Write one ``u v w`` line per edge (labels must not contain whitespace)."""
+    ag = as_array_graph(G)
+    labels = ag.nodes
+    with open(path, "w") as f:
+        f.writelines(f"{labels[u]} {labels[v]} {w}\n" for u, v, w in
+                     zip(ag.sources.tolist(), ag.targets.tolist(), ag.weights.tolist()))
+
+
+def read_edge_list(path: str) -> ArrayGraph:
+    """Read a ``u v w`` edge list into an ArrayGraph, see graphs.edge_list.load_edge_list."""
+    from graphs.edge_list import load_edge_list # graphs.edge_list imports this module
+    return load_edge_list(path)
+
+
+def convert_edge_list(edge_path: str, path: str, duals=None, predictions=None):
+    """
+    Store a ``u v w`` edge list in the binary format.
+
+    Without duals or predictions the CSR arrays are streamed straight into
+    ``path``, so the edge list never has to fit in memory.
+    """
+    if duals is None and predictions is None:
+        from graphs.edge_list import load_edge_list
+        load_edge_list(edge_path, out_path=path)
+    else:
+        save_graph(path, read_edge_list(edge_path), duals, predictions)
+
+
+def export_edge_list(path: str, edge_path: str):
+    """Write a stored graph back out as a ``u v w`` edge list."""
+    write_edge_list(load_graph(path)[0], edge_path)
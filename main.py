@@ -6,21 +6,38 @@ import networkx as nx
 import matplotlib.pyplot as plt
 from utils.rounding import round_re_duals, reduced_edge_lengths, reduced_edge_lengths_after
 from graphs.graph_generator import create_layered_toy_graph
+from utils.profiling import profile_rounding
+from utils.visualization import shortest_path_tree, draw_shortest_path_tree, _tree_order
+import numpy as np
+from algorithms.bellman_ford import NegativeCycleError, super_source_potentials
+from algorithms.scc import tarjan_scc
+from utils.rounding import _ReducedLengthState, build_G_minus, round_re_duals_scaled, RPfRELD_experiment_version
+from utils.rounding import round_re_duals_batch, repair_duals
+from graphs.array_graph import ArrayGraph
+from algorithms.johnson import all_pairs_shortest_paths
+from algorithms.dijkstra import PotentialDijkstra
+import os
+import tempfile
+from graphs.storage import save_graph, load_graph, load_networkx, write_edge_list
+from graphs.edge_list import load_edge_list
+from utils.cache import ResultCache
+
+LARGE_GRAPH_NODES = 300 # spring_layout and full drawing stop being usable around here
+
+def visualize_graph_with_paths(G, predecessors, source, distances=None, path=None, max_nodes=5000):
+    # Only the tree edges, one per reached node
+    path_edges = shortest_path_tree(predecessors, source)
+
+    # Big graphs (or when asked for a file): draw just the tree with a cheap layout, no window
+    if path is not None or G.number_of_nodes() > LARGE_GRAPH_NODES:
+        path = path or "shortest_path_tree.png"
+        n_drawn = draw_shortest_path_tree(predecessors, source, path, distances=distances, max_nodes=max_nodes)
+        print(f"Wrote shortest-path tree ({n_drawn} nodes) to {path}")
+        return
 
-def visualize_graph_with_paths(G, predecessors, source):
     pos = nx.spring_layout(G)
     edge_labels = nx.get_edge_attributes(G, 'weight')
 
-    # Build list of edges in shortest paths (source to each reachable node)
-    path_edges = []
-    for target in G.nodes:
-        if target == source or predecessors[target] is None:
-            continue
-        current = target
-        while current != source and predecessors[current] is not None:
-            path_edges.append((predecessors[current], current))
-            current = predecessors[current]
-
     # Draw full graph
     nx.draw(G, pos, with_labels=True, node_color='lightblue', edge_color='gray', arrows=True)
     nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
@@ -91,9 +108,13 @@ def test_rounding_on_random_graph():
     print("Edge weights:")
     for u, v, data in G.edges(data=True):
         print(f"  {u} → {v} (weight = {data['weight']})")
-    y_feasible = round_re_duals(G, y_pred)
+    with profile_rounding() as prof:
+        y_feasible = round_re_duals(G, y_pred)
     print("\nFeasible (rounded) duals:", y_feasible)
     reduced_edge_lengths_after(G, y_feasible)
+    print("\nTime per phase:")
+    for phase, tot in prof.summary().items():
+        print(f"  {phase}: {tot['wall_ns'] / 1e6:.1f} ms over {tot['calls']} calls")
 
 
 def test_bellman_ford_on_generated_graph():
@@ -118,11 +139,412 @@ def test_bellman_ford_on_generated_graph():
         for node, pred in predecessors.items():
             print(f"  {node} ← {pred}")
 
-        visualize_graph_with_paths(G, predecessors, source)
+        visualize_graph_with_paths(G, predecessors, source, distances)
 
     except ValueError as e:
         print("❌ Error:", e)
 
+def _same_partition(a, b):
+    # Two SCC labelings agree up to renaming the ids
+    pairs = set(zip(a.tolist(), b.tolist()))
+    return len(pairs) == len(set(a.tolist())) == len(set(b.tolist()))
+
+
+def test_incremental_scc_matches_tarjan(n_graphs=100, steps=60, seed=0):
+    print("\n=== Test: Incremental SCCs vs full Tarjan on G_minus ===")
+    rng = np.random.default_rng(seed)
+    checks = 0
+    for g in range(n_graphs):
+        ag = generate_random_graph(40, 0.08, (-6, 6), allow_negative_cycles=True, seed=int(rng.integers(1 << 30)), as_array=True)
+        state = _ReducedLengthState(ag, rng.integers(-3, 4, size=ag.n).astype(np.int64))
+        for _ in range(steps):
+            H, comp, n_comps, order = state.condense()
+            full, n_full = tarjan_scc(build_G_minus(ag, ag.to_dict(state.y)))
+            assert n_comps == n_full and _same_partition(comp, full), f"graph {g}: SCCs differ from Tarjan"
+            # Every condensation edge must go forward in the returned order
+            rank = np.empty(n_comps, dtype=np.int64)
+            rank[order] = np.arange(n_comps)
+            assert len(order) == n_comps and np.all(rank[H.sources] < rank[H.targets]), f"graph {g}: bad topological order"
+            checks += 1
+            # Move a few duals up or down, so G_minus both gains and loses edges
+            nodes = rng.choice(ag.n, size=int(rng.integers(1, 6)), replace=False)
+            state.decrement(nodes, int(rng.choice([-2, -1, 1, 2])))
+    print(f"{checks} condense() calls matched Tarjan")
+
+
+def _check_negative_cycle(G, cycle):
+    # A reported cycle must be closed, made of edges of G and of negative weight
+    assert cycle[0] == cycle[-1], "cycle not closed"
+    weight = {(u, v): w for (u, v), w in zip(G.edge_labels(), G.weights.tolist())}
+    assert sum(weight[u, v] for u, v in zip(cycle, cycle[1:])) < 0, "cycle not negative"
+
+
+def test_bellman_ford_methods_agree(methods=("classic", "vectorized", "spfa", "goldberg_radzik"), n_graphs=60, seed=0):
+    print("\n=== Test: Bellman-Ford methods agree ===")
+    rng = np.random.default_rng(seed)
+    n_cycles = 0
+    for g in range(n_graphs):
+        G = generate_random_graph(50, 0.06, (-8, 10), allow_negative_cycles=(g % 3 == 0),
+                                  seed=int(rng.integers(1 << 30)), as_array=True)
+        results = {}
+        for method in methods:
+            try:
+                results[method] = bellman_ford(G, 0, method=method)[0]
+            except NegativeCycleError as e:
+                _check_negative_cycle(G, e.cycle)
+                results[method] = None
+        reference = results["classic"]
+        for method, dist in results.items():
+            assert dist == reference, f"graph {g}: {method} disagrees with classic"
+        n_cycles += reference is None
+    print(f"{len(methods)} methods agree on {n_graphs} graphs ({n_cycles} with a negative cycle)")
+
+
+def _assert_feasible(G, y, what):
+    red = reduced_edge_lengths(G, y)
+    assert not red or min(red.values()) >= 0, f"{what}: duals not feasible"
+
+
+def test_scaled_rounding_is_feasible(n_graphs=60, seed=0):
+    print("\n=== Test: Scaled rounding gives feasible duals below the prediction ===")
+    rng = np.random.default_rng(seed)
+    n_cycles = 0
+    for g in range(n_graphs):
+        W = (10, 100, 1000)[g % 3]
+        G = generate_random_graph(60, 0.06, (-W, W), allow_negative_cycles=(g % 4 == 0),
+                                  seed=int(rng.integers(1 << 30)), as_array=True)
+        y_pred = G.to_dict(rng.integers(-W, W + 1, size=G.n))
+        try:
+            exact = RPfRELD_experiment_version(G, {}, y_pred)
+        except NegativeCycleError:
+            exact = None
+        try:
+            y = round_re_duals_scaled(G, y_pred)
+        except ValueError:
+            assert exact is None, f"graph {g}: scaled rounding reported a negative cycle that does not exist"
+            n_cycles += 1
+            continue
+        assert exact is not None, f"graph {g}: scaled rounding missed a negative cycle"
+        _assert_feasible(G, y, f"graph {g}")
+        # Rounding only lowers duals, and the exact duals are the largest feasible ones below y_pred
+        assert all(y[v] <= exact[v] <= y_pred[v] for v in G.nodes), f"graph {g}: duals above the exact ones"
+    print(f"Scaled rounding feasible on {n_graphs - n_cycles} graphs, {n_cycles} negative cycles detected")
+
+
+def test_batch_rounding_matches_single(n_graphs=10, samples=8, seed=0):
+    print("\n=== Test: Batch rounding vs one round_re_duals call per sample ===")
+    rng = np.random.default_rng(seed)
+    for g in range(n_graphs):
+        G = generate_random_graph(60, 0.06, (-10, 10), seed=int(rng.integers(1 << 30)), as_array=True)
+        Y_pred = rng.integers(-10, 11, size=(samples, G.n))
+        Y_pred[0] = G.to_array(RPfRELD_experiment_version(G, {}, G.to_dict(Y_pred[0]))) # already feasible
+        for decrement in ("unit", "bulk"):
+            Y, iterations = round_re_duals_batch(G, Y_pred, decrement=decrement)
+            assert iterations[0] == 0 and np.array_equal(Y[0], Y_pred[0]), f"graph {g}: feasible sample was changed"
+            for k in range(samples):
+                y = round_re_duals(G, G.to_dict(Y_pred[k]), decrement=decrement)
+                assert np.array_equal(Y[k], G.to_array(y)), f"graph {g}, sample {k}: differs from round_re_duals"
+        Y_pool, it_pool = round_re_duals_batch(G, Y_pred, decrement="bulk", processes=2)
+        assert np.array_equal(Y_pool, Y) and np.array_equal(it_pool, iterations), f"graph {g}: process pool differs"
+
+    # A sample the unit loop cannot finish must raise, not come back infeasible
+    G = ArrayGraph.from_edges(range(2), [0], [1], [-20000])
+    try:
+        round_re_duals_batch(G, np.array([[0, 0], [0, -20000]])) # sample 1 is feasible
+        raise AssertionError("iteration limit not reported")
+    except RuntimeError as e:
+        assert str(e).startswith("Sample 0:"), e
+    print(f"Batch rounding matched on {n_graphs} graphs x {samples} samples, iteration limit reported")
+
+
+def test_johnson_matches_networkx(n_graphs=20, seed=0):
+    print("\n=== Test: Johnson all-pairs vs networkx ===")
+    rng = np.random.default_rng(seed)
+    for g in range(n_graphs):
+        G = generate_random_graph(40, 0.08, (-8, 10), seed=int(rng.integers(1 << 30)))
+        expected = dict(nx.all_pairs_bellman_ford_path_length(G))
+        nodes = list(G.nodes)
+        reference = np.array([[expected[u].get(v, np.inf) for v in nodes] for u in nodes])
+        y = round_re_duals(G, {v: 0 for v in nodes})
+        for dist in (all_pairs_shortest_paths(G), all_pairs_shortest_paths(G, y),
+                     all_pairs_shortest_paths(G, y, processes=2)):
+            assert np.array_equal(dist, reference), f"graph {g}: all-pairs distances differ from networkx"
+    # Infeasible duals are rejected
+    G = generate_random_graph(20, 0.2, (-8, 10), seed=seed)
+    try:
+        all_pairs_shortest_paths(G, {v: 0 for v in G.nodes})
+        raise AssertionError("infeasible duals accepted")
+    except ValueError:
+        pass
+    print(f"Johnson matched networkx on {n_graphs} graphs (own duals, rounded duals, process pool)")
+
+
+def test_potential_dijkstra_matches_bellman_ford(n_graphs=30, sources=5, seed=0):
+    print("\n=== Test: PotentialDijkstra vs bellman_ford ===")
+    rng = np.random.default_rng(seed)
+    for g in range(n_graphs):
+        G = generate_random_graph(60, 0.06, (-8, 10), seed=int(rng.integers(1 << 30)), as_array=True)
+        sp = PotentialDijkstra(G, round_re_duals(G, {v: 0 for v in G.nodes}, decrement="bulk"))
+        weight = {(u, v): w for (u, v), w in zip(G.edge_labels(), G.weights.tolist())}
+        for source in rng.choice(G.n, size=sources, replace=False).tolist():
+            dist, pred = sp.shortest_paths(source)
+            expected, _ = bellman_ford(G, source)
+            assert dist == expected, f"graph {g}, source {source}: distances differ from bellman_ford"
+            # Ties may pick another predecessor, but every tree edge must be tight
+            for v, p in pred.items():
+                assert (p is None) == (v == source or dist[v] == float('inf')), f"graph {g}: bad predecessor of {v}"
+                assert p is None or dist[p] + weight[p, v] == dist[v], f"graph {g}: edge ({p}, {v}) not tight"
+    try:
+        PotentialDijkstra(G, {v: 0 for v in G.nodes})
+        raise AssertionError("infeasible duals accepted")
+    except ValueError:
+        pass
+    print(f"PotentialDijkstra matched bellman_ford on {n_graphs} graphs x {sources} sources")
+
+
+def test_repair_duals_matches_oracle(n_graphs=60, seed=0):
+    print("\n=== Test: repair_duals vs exact super-source duals ===")
+    rng = np.random.default_rng(seed)
+    n_cycles = 0
+    for g in range(n_graphs):
+        G = generate_random_graph(50, 0.06, (-8, 10), seed=int(rng.integers(1 << 30)))
+        y_prev = RPfRELD_experiment_version(G, {}, {v: 0 for v in G.nodes})
+        assert min(reduced_edge_lengths(G, y_prev).values()) >= 0, f"graph {g}: oracle duals infeasible"
+        changed = [tuple(e) for e in rng.permutation(list(G.edges))[:3]]
+        for u, v in changed:
+            G[u][v]['weight'] -= int(rng.integers(1, 8))
+        try:
+            expected = RPfRELD_experiment_version(G, {}, y_prev)
+        except NegativeCycleError:
+            expected = None
+        try:
+            y = repair_duals(G, y_prev, changed)
+        except ValueError:
+            y = None
+        assert y == expected, f"graph {g}: repair_duals differs from the oracle"
+        n_cycles += expected is None
+    print(f"repair_duals matched the oracle on {n_graphs} updates ({n_cycles} created a negative cycle)")
+
+
+def test_parallel_bellman_ford_matches_vectorized(n_graphs=40, seed=0):
+    print("\n=== Test: Parallel Bellman-Ford vs vectorized ===")
+    rng = np.random.default_rng(seed)
+    n_cycles = 0
+    for g in range(n_graphs):
+        G = generate_random_graph(300, 0.01, (-8, 10), allow_negative_cycles=(g % 3 == 0),
+                                  seed=int(rng.integers(1 << 30)), as_array=True)
+        try:
+            expected = bellman_ford(G, 0)
+        except NegativeCycleError:
+            expected = None
+        for workers in (1, 2, 3, 7):
+            try:
+                result = bellman_ford(G, 0, method="parallel", workers=workers)
+            except NegativeCycleError as e:
+                assert expected is None, f"graph {g}, {workers} workers: spurious negative cycle"
+                _check_negative_cycle(G, e.cycle)
+                continue
+            # Both engines run the same Jacobi passes, so even the predecessors match
+            assert result == expected, f"graph {g}, {workers} workers: differs from vectorized"
+        n_cycles += expected is None
+    print(f"Parallel engine matched vectorized on {n_graphs} graphs ({n_cycles} with a negative cycle)")
+
+
+def _same_graph(a, b):
+    return (list(a.nodes) == list(b.nodes) and np.array_equal(a.offsets, b.offsets)
+            and np.array_equal(a.targets, b.targets) and np.array_equal(a.weights, b.weights))
+
+
+def test_storage_round_trip(seed=0):
+    print("\n=== Test: Binary graph storage round trip ===")
+    rng = np.random.default_rng(seed)
+    G = generate_random_graph(200, 0.03, (-8, 10), seed=seed, as_array=True)
+    relabelled = {
+        "range": G,
+        "str": ArrayGraph([f"v{i}" for i in range(G.n)], G.offsets, G.sources, G.targets, G.weights),
+        "tuple": ArrayGraph([(i // 20, i % 20) for i in range(G.n)], G.offsets, G.sources, G.targets, G.weights),
+        "float": G.with_weights(G.weights / 4),
+        "empty": ArrayGraph.from_edges(range(5), [], [], np.zeros(0, dtype=np.int64)),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "g.bin")
+        for name, H in relabelled.items():
+            duals = H.to_dict(rng.integers(-5, 5, size=H.n))
+            predictions = rng.normal(size=(3, H.n))
+            save_graph(path, H, duals, predictions)
+            loaded, y, Y = load_graph(path)
+            assert _same_graph(loaded, H) and loaded.weights.dtype == H.weights.dtype, f"{name}: graph changed"
+            assert np.array_equal(y, H.to_array(duals)) and np.array_equal(Y, predictions), f"{name}: node values changed"
+            assert not loaded.weights.flags.writeable, f"{name}: default mode should be read-only"
+            assert nx.utils.graphs_equal(load_networkx(path), H.to_networkx()), f"{name}: networkx view differs"
+            # Copy-on-write: edits stay in this process, the file is untouched
+            copy, _, _ = load_graph(path, mmap_mode="c")
+            if copy.m:
+                copy.weights[0] += 1
+            assert _same_graph(load_graph(path)[0], H), f"{name}: copy-on-write edit reached the file"
+        save_graph(path, G)
+        assert load_graph(path)[1:] == (None, None), "duals and predictions should be optional"
+    print(f"Stored and reloaded {len(relabelled)} graphs (range, str, tuple labels, float weights, no edges)")
+
+
+def _labelled_edges(G):
+    return sorted((u, v, w) for (u, v), w in zip(G.edge_labels(), G.weights.tolist()))
+
+
+def test_edge_list_round_trip(seed=0):
+    print("\n=== Test: Streaming edge-list loader round trip ===")
+    G = generate_random_graph(300, 0.02, (-8, 10), seed=seed, as_array=True)
+    S = ArrayGraph([f"n{i}" for i in range(G.n)], G.offsets, G.sources, G.targets, G.weights)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "edges.txt")
+        for H in (G, S):
+            write_edge_list(H, path)
+            with open(path) as f:
+                lines = f.readlines()
+            with open(path, "w") as f: # comments and blank lines are skipped
+                f.writelines(["# header\n", "% another\n"] + lines[:10] + ["\n"] + lines[10:])
+            reference = load_edge_list(path)
+            assert _labelled_edges(reference) == _labelled_edges(H), "edges changed"
+            assert reference.weights.dtype == np.int64, "integer weights should stay integers"
+            # Chunk size and streaming into a file must not change anything, node ids included
+            for chunk_bytes in (64, 997, 10_000):
+                assert _same_graph(load_edge_list(path, chunk_bytes=chunk_bytes), reference), f"chunk_bytes={chunk_bytes} differs"
+            streamed = load_edge_list(path, chunk_bytes=997, out_path=os.path.join(tmp, "g.bin"))
+            assert _same_graph(streamed, reference) and _same_graph(load_graph(os.path.join(tmp, "g.bin"))[0], reference)
+            assert nx.utils.graphs_equal(load_edge_list(path, as_networkx=True), reference.to_networkx())
+
+        # Unweighted files, and malformed lines must raise instead of being misread
+        with open(path, "w") as f:
+            f.write("1 2\n3 4\n5 6\n")
+        assert load_edge_list(path, weighted=False).weights.tolist() == [1, 1, 1]
+        for bad in ("1 2\n3 4\n5 6\n", "a b 1\nc d\n", "1 2 3\n3 4 x\n"):
+            with open(path, "w") as f:
+                f.write(bad)
+            try:
+                load_edge_list(path)
+                raise AssertionError(f"malformed file accepted: {bad!r}")
+            except ValueError:
+                pass
+    print("Edge lists reloaded identically for int and str labels, all chunk sizes, streamed or not")
+
+
+def test_result_cache(seed=0):
+    print("\n=== Test: Content-addressed result cache ===")
+    G = generate_random_graph(100, 0.05, (-8, 10), seed=seed, as_array=True)
+    copy = ArrayGraph(list(G.nodes), G.offsets.copy(), G.sources.copy(), G.targets.copy(), G.weights.copy())
+    cache = ResultCache()
+    dist = cache.call(bellman_ford, G, 0)[0]
+    # Same content through other objects (a copy, the networkx view) hits
+    assert cache.call(bellman_ford, copy, 0)[0] == dist and cache.call(bellman_ford, G.to_networkx(), 0)[0] == dist
+    assert (cache.hits, cache.misses) == (2, 1), cache.stats()
+    # A hit is a fresh copy
+    cache.call(bellman_ford, G, 0)[0][1] = "changed"
+    assert cache.call(bellman_ford, G, 0)[0] == dist, "a hit shared state with an earlier caller"
+    # Editing a writable array in place must invalidate
+    copy.weights[:] = 100
+    assert cache.call(bellman_ford, copy, 0)[0] == bellman_ford(copy, 0)[0], "stale result after an in-place edit"
+    # Errors are not cached
+    calls = []
+    def failing():
+        calls.append(1)
+        raise ValueError("negative cycle")
+    for _ in range(2):
+        try:
+            cache.get_or_compute("failing", failing)
+        except ValueError:
+            pass
+    assert len(calls) == 2, "an exception was cached"
+    # The disk tier serves later caches, but only those of the same code version
+    with tempfile.TemporaryDirectory() as tmp:
+        ResultCache(disk_dir=tmp).call(bellman_ford, G, 0)
+        again = ResultCache(disk_dir=tmp)
+        assert again.call(bellman_ford, G, 0)[0] == dist and again.disk_hits == 1, again.stats()
+        other = ResultCache(disk_dir=tmp, versioned=False)
+        other.call(bellman_ford, G, 0)
+        assert other.disk_hits == 0, "entries of another code version were served"
+    # The memory tier stays within max_bytes
+    small = ResultCache(max_bytes=4000)
+    for source in range(20):
+        small.call(bellman_ford, G, source)
+    assert small.bytes <= 4000 and small.evictions > 0, small.stats()
+    print("Cache hits, invalidation, disk tier, code versioning and eviction behave")
+
+
+def _super_source_distances(G, y_hat):
+    # networkx reference: residual graph under y_hat plus a real super-source "s" with 0-weight edges to every node
+    R = nx.DiGraph()
+    R.add_weighted_edges_from((u, v, w + y_hat[u] - y_hat[v]) for u, v, w in G.edges(data='weight'))
+    R.add_weighted_edges_from(("s", v, 0) for v in G.nodes)
+    try:
+        return nx.single_source_bellman_ford_path_length(R, "s")
+    except nx.NetworkXUnbounded:
+        return None
+
+
+def test_super_source_oracle_matches_networkx(n_graphs=200, seed=0):
+    print("\n=== Test: Super-source dual oracle vs networkx with an explicit super-source ===")
+    rng = np.random.default_rng(seed)
+    n_cycles = 0
+    for g in range(n_graphs):
+        G = generate_random_graph(40, 0.08, (-10, 10), allow_negative_cycles=(g % 3 == 0), seed=int(rng.integers(1 << 30)))
+        y_hat = {v: int(rng.integers(-5, 5)) for v in G.nodes}
+        d = _super_source_distances(G, y_hat)
+        try:
+            y = RPfRELD_experiment_version(G, {}, y_hat)
+        except NegativeCycleError as e:
+            assert d is None, f"graph {g}: spurious negative cycle"
+            _check_negative_cycle(ArrayGraph.from_networkx(G), e.cycle)
+            n_cycles += 1
+            continue
+        assert d is not None, f"graph {g}: negative cycle missed"
+        assert y == {v: y_hat[v] + d[v] for v in G.nodes}, f"graph {g}: duals differ from networkx"
+        _assert_feasible(G, y, f"graph {g}")
+        # With y_hat = 0 the residual graph is G itself
+        d0 = _super_source_distances(G, {v: 0 for v in G.nodes})
+        assert super_source_potentials(G)[0] == {v: d0[v] for v in G.nodes}, f"graph {g}: super_source_potentials differs"
+    print(f"Oracle matched networkx on {n_graphs} graphs ({n_cycles} with a negative cycle)")
+
+
+def test_shortest_path_tree(n_graphs=20, seed=0):
+    print("\n=== Test: Shortest-path tree extraction and rendering ===")
+    rng = np.random.default_rng(seed)
+    for g in range(n_graphs):
+        G = generate_random_graph(80, 0.04, (-8, 10), seed=int(rng.integers(1 << 30)))
+        dist, pred = bellman_ford(G, 0)
+        edges = shortest_path_tree(pred, 0)
+        # Same edge set as walking the chain back from every target, without duplicates
+        walked = set()
+        for target in G.nodes:
+            current = target
+            while current != 0 and pred[current] is not None:
+                walked.add((pred[current], current))
+                current = pred[current]
+        assert len(edges) == len(set(edges)) and set(edges) == walked, f"graph {g}: tree edges differ from the chain walk"
+        # A cut tree keeps every drawn node's predecessor, so it stays connected to the source
+        order, _ = _tree_order(edges, 0)
+        kept = set(order[:10])
+        assert all(pred[v] in kept for v in order[1:10]), f"graph {g}: cut tree is disconnected"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree.png")
+        n_drawn = draw_shortest_path_tree(pred, 0, path, distances=dist, max_nodes=10)
+        assert n_drawn == min(10, len(order)) and os.path.getsize(path) > 0, "tree image not written"
+        visualize_graph_with_paths(G, pred, 0, dist, path=path) # file mode, never opens a window
+    print(f"Tree edges matched the chain walk on {n_graphs} graphs, image written")
+
+
 if __name__ == "__main__":
     print("\n" + "="*40 + "\n")
-    test_rounding_on_random_graph()
\ No newline at end of file
+    test_rounding_on_random_graph()
+    test_incremental_scc_matches_tarjan()
+    test_bellman_ford_methods_agree()
+    test_scaled_rounding_is_feasible()
+    test_batch_rounding_matches_single()
+    test_johnson_matches_networkx()
+    test_potential_dijkstra_matches_bellman_ford()
+    test_repair_duals_matches_oracle()
+    test_parallel_bellman_ford_matches_vectorized()
+    test_storage_round_trip()
+    test_edge_list_round_trip()
+    test_result_cache()
+    test_super_source_oracle_matches_networkx()
+    test_shortest_path_tree()
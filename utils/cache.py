@@ -0,0 +1,200 @@
+# utils/cache.py
+
+import hashlib
+import os
+import pickle
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import networkx as nx
+
+from graphs.array_graph import ArrayGraph, has_identity_labels
+
+# Packages whose source goes into every cache key, relative to the repository root
+SOURCE_DIRS = ("algorithms", "graphs", "utils", "experiments")
+_code_fingerprint: Optional[bytes] = None
+
+# Fingerprints of ArrayGraphs whose arrays are all read-only (e.g. load_graph's default mode), which cannot change
+_fingerprints: "weakref.WeakKeyDictionary[ArrayGraph, bytes]" = weakref.WeakKeyDictionary()
+
+
+def _hash_array(h, arr: np.ndarray):
+    arr = np.ascontiguousarray(arr)
+    h.update(f"{arr.dtype.str}{arr.shape}".encode())
+    h.update(memoryview(arr).cast("B"))
+
+
+def graph_fingerprint(G) -> bytes:
+    """
+    Content hash of a graph: node labels plus the offsets, targets and weights arrays.
+
+    BLAKE2b over the raw buffers, so hashing runs at memory speed. The hash is
+    memoized per ArrayGraph only when all three arrays are read-only; writable
+    arrays (and an ``nx.DiGraph``) may be modified in place, so they are
+    hashed again on every call.
+    """
+    if isinstance(G, nx.DiGraph):
+        return graph_fingerprint(ArrayGraph.from_networkx(G))
+    cached = _fingerprints.get(G)
+    if cached is not None:
+        return cached
+    h = hashlib.blake2b(digest_size=16)
+    if has_identity_labels(G.nodes):
+        h.update(f"range({G.n})".encode())
+    else:
+        h.update(pickle.dumps(G.nodes, protocol=4))
+    arrays = (G.offsets, G.targets, G.weights)
+    for arr in arrays:
+        _hash_array(h, arr)
+    digest = h.digest()
+    if not any(arr.flags.writeable for arr in arrays):
+        _fingerprints[G] = digest
+    return digest
+
+
+def code_fingerprint() -> bytes:
+    """
+    Hash of the repository's solver code: every ``.py`` file under SOURCE_DIRS.
+
+    Read from disk once per process, so it does not depend on which modules
+    happen to be imported. Any edit to the solvers (or the benchmark) changes it.
+    """
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        h = hashlib.blake2b(digest_size=16)
+        for package in SOURCE_DIRS:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(root, package)):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if name.endswith(".py"):
+                        path = os.path.join(dirpath, name)
+                        h.update(os.path.relpath(path, root).encode())
+                        with open(path, "rb") as f:
+                            h.update(hashlib.blake2b(f.read(), digest_size=16).digest())
+        _code_fingerprint = h.digest()
+    return _code_fingerprint
+
+
+def _digest(h, value):
+    # Feed one argument into the key hash
+    if isinstance(value, (ArrayGraph, nx.DiGraph)):
+        h.update(b"G")
+        h.update(graph_fingerprint(value))
+    elif isinstance(value, np.ndarray):
+        h.update(b"A")
+        _hash_array(h, value)
+    else:
+        h.update(b"P")
+        h.update(pickle.dumps(value, protocol=4))
+
+
+class ResultCache:
+    """
+    Content-addressed cache for solver results (duals, distances, ...).
+
+    Keys hash the graph's arrays together with the prediction or source and
+    any parameters, so identical inputs hit no matter which objects carry
+    them. Keys also include code_fingerprint(), so after any change to the
+    solver code earlier results (e.g. in the disk tier) are never served;
+    ``versioned=False`` drops it for callers that manage versions themselves. Results are stored pickled: the in-memory tier is an LRU bounded
+    by ``max_bytes`` of pickled data, and with ``disk_dir`` every result is
+    also written there and read back on a memory miss (e.g. by a later run).
+    A hit returns a fresh copy, so callers may modify it.
+
+    Usage:
+        cache = ResultCache(disk_dir="cache")
+        y = cache.call(round_re_duals, G, y_pred, decrement="bulk")
+        cache.stats() # {'hits': ..., 'misses': ..., ...}
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, disk_dir: Optional[str] = None, versioned: bool = True):
+        self.max_bytes = max_bytes
+        self.salt = code_fingerprint() if versioned else b""
+        self.disk_dir = disk_dir
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, name: str, *args, **kwargs) -> str:
+        """Hex key of a call: code version, solver name, positional arguments and sorted keyword arguments."""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(self.salt)
+        h.update(name.encode())
+        for value in args:
+            _digest(h, value)
+        for k in sorted(kwargs):
+            h.update(k.encode())
+            _digest(h, kwargs[k])
+        return h.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _remember(self, key: str, blob: bytes):
+        if len(blob) > self.max_bytes:
+            return
+        if key in self._memory:
+            self.bytes -= len(self._memory.pop(key))
+        self._memory[key] = blob
+        self.bytes += len(blob)
+        while self.bytes > self.max_bytes:
+            _, old = self._memory.popitem(last=False)
+            self.bytes -= len(old)
+            self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Stored result for ``key``, or ``compute()`` stored under it.
+
+        Exceptions from ``compute`` (e.g. a negative cycle) propagate and are not cached.
+        """
+        blob = self._memory.get(key)
+        if blob is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return pickle.loads(blob)
+        if self.disk_dir is not None and os.path.exists(self._disk_path(key)):
+            with open(self._disk_path(key), "rb") as f:
+                blob = f.read()
+            self._remember(key, blob)
+            self.hits += 1
+            self.disk_hits += 1
+            return pickle.loads(blob)
+
+        self.misses += 1
+        result = compute()
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, blob)
+        if self.disk_dir is not None:
+            tmp = self._disk_path(key) + f".{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._disk_path(key)) # atomic, concurrent writers of one key are harmless
+        return result
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """``fn(*args, **kwargs)`` through the cache, keyed by the function's qualified name and its arguments."""
+        key = self.key(f"{fn.__module__}.{fn.__qualname__}", *args, **kwargs)
+        return self.get_or_compute(key, lambda: fn(*args, **kwargs))
+
+    def clear(self, disk: bool = False):
+        """Drop the in-memory tier (and the disk tier too with ``disk=True``)."""
+        self._memory.clear()
+        self.bytes = 0
+        if disk and self.disk_dir is not None:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current memory use."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self._memory), "bytes": self.bytes}
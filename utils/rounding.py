@@ -1,101 +1,404 @@
 # utils/rounding.py
 
-import networkx as nx
+import heapq
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from collections import defaultdict
-from typing import Dict
+from typing import Callable, Dict, Optional, Tuple
+
+from graphs.array_graph import ArrayGraph, as_array_graph
+from algorithms.bellman_ford import NegativeCycleError, _super_source_arrays
+from algorithms.scc import tarjan_scc, tarjan_scc_adjacency
+from utils.tracing import TRACE, IterationStats
+from utils.profiling import PhaseTimer, active_profiler
+
+logger = logging.getLogger(__name__)
+
+def _reduced_lengths_array(ag: ArrayGraph, y) -> np.ndarray:
+    # w_uv + y[u] - y[v] for every edge, in edge-array order
+    return ag.weights + y[ag.sources] - y[ag.targets]
 
 def reduced_edge_lengths(G, y):
-    red_lens = {}
-    for u, v, data in G.edges(data=True):
-        red_lens[(u, v)] = data['weight'] + y[u] - y[v]
-    return red_lens
+    ag = as_array_graph(G)
+    red = _reduced_lengths_array(ag, ag.to_array(y))
+    return dict(zip(ag.edge_labels(), red.tolist()))
 
 def build_G_minus(G, y):
-    G_minus = nx.DiGraph()
-    for u, v, data in G.edges(data=True):
-        red_len = data['weight'] + y[u] - y[v]
-        if red_len <= 0:
-            G_minus.add_edge(u, v, weight=red_len)
-    G_minus.add_nodes_from(G.nodes())
-    return G_minus
+    ag = as_array_graph(G)
+    red = _reduced_lengths_array(ag, ag.to_array(y))
+    G_minus = ag.subgraph_edges(red <= 0, red)
+    if isinstance(G, ArrayGraph):
+        return G_minus
+    return G_minus.to_networkx()
+
+def _condensation(n_comps: int, cu: np.ndarray, cv: np.ndarray, w: np.ndarray) -> ArrayGraph:
+    """
+    Condensation graph from the SCC ids of every edge's endpoints.
+
+    Edges inside an SCC are dropped and parallel edges between two SCCs are
+    merged into one carrying the minimum weight (the only one that matters
+    for the layer distances).
+    """
+    keep = cu != cv
+    cu, cv, w = cu[keep], cv[keep], w[keep]
+    key = cu.astype(np.int64) * n_comps + cv
+    order = np.lexsort((w, key)) # by SCC pair, lightest first
+    key = key[order]
+    first = order[np.concatenate([[True], key[1:] != key[:-1]])] if key.size else order
+    return ArrayGraph.from_edges(range(n_comps), cu[first], cv[first], w[first])
+
+def _topological_order(H: ArrayGraph) -> list:
+    # Kahn's algorithm; plain lists, a NumPy step per DAG level is slower on deep DAGs like grids
+    offsets = H.offsets.tolist()
+    targets = H.targets.tolist()
+    indeg = np.bincount(H.targets, minlength=H.n).tolist()
+    order = [c for c in range(H.n) if indeg[c] == 0]
+    for c in order: # order grows while we walk it
+        for e in range(offsets[c], offsets[c + 1]):
+            t = targets[e]
+            indeg[t] -= 1
+            if indeg[t] == 0:
+                order.append(t)
+    return order
+
+def _reach(H: ArrayGraph, seeds: np.ndarray, forward: bool = True) -> np.ndarray:
+    # Boolean mask of the nodes of H reachable from (forward) or reaching (backward) the seeds
+    seen = np.zeros(H.n, dtype=bool)
+    frontier = np.unique(seeds)
+    seen[frontier] = True
+    while frontier.size:
+        if forward:
+            nxt = H.targets[H.out_edge_ids(frontier)]
+        else:
+            nxt = H.sources[H.in_edge_ids(frontier)]
+        frontier = np.unique(nxt[~seen[nxt]])
+        seen[frontier] = True
+    return seen
+
+def _tarjan_on(nodes: np.ndarray, src: np.ndarray, dst: np.ndarray, n: int) -> Tuple[np.ndarray, int]:
+    # Tarjan on the subgraph induced by ``nodes`` (ids < n), given the candidate edges src -> dst
+    local = np.full(n, -1, dtype=np.int64)
+    local[nodes] = np.arange(nodes.size)
+    lu, lv = local[src], local[dst]
+    inside = (lu >= 0) & (lv >= 0)
+    successors = [[] for _ in range(nodes.size)]
+    for u, v in zip(lu[inside].tolist(), lv[inside].tolist()):
+        successors[u].append(v)
+    return tarjan_scc_adjacency(successors)
+
+def _condense(ag: ArrayGraph):
+    # Returns the condensation H (node ids = SCC ids), the per-node SCC id array and the SCC count
+    comp, n_comps = tarjan_scc(ag)
+    H = _condensation(n_comps, comp[ag.sources], comp[ag.targets], ag.weights)
+    return H, comp, n_comps
 
 def contract_scc(G_minus):
-    sccs = list(nx.strongly_connected_components(G_minus))
-    mapping = {}
-    for i, scc in enumerate(sccs):
-        for v in scc:
-            mapping[v] = i
-    H = nx.DiGraph()
-    for u, v, data in G_minus.edges(data=True):
-        cu, cv = mapping[u], mapping[v]
-        if cu != cv:
-            H.add_edge(cu, cv, weight=data['weight'])
-    H.add_nodes_from(range(len(sccs)))
+    ag = as_array_graph(G_minus)
+    H, comp, n_comps = _condense(ag)
+    sccs = [set() for _ in range(n_comps)]
+    for label, c in zip(ag.nodes, comp.tolist()):
+        sccs[c].add(label)
+    mapping = ag.to_dict(comp)
+    if not isinstance(G_minus, ArrayGraph):
+        H = H.to_networkx()
     return H, mapping, sccs
 
-def round_re_duals(G, y_pred):
-    y = y_pred.copy()
-    last_neg_edges = None
-    last_selected_sccs = None
-    same_count = 0
+def _dag_layers(H: ArrayGraph, order) -> list:
+    """
+    Layer index of every SCC in the condensation H, in O(V + E).
+
+    Equivalent to shortest paths from a virtual super-source with a 0-weight
+    edge to every SCC: dist[c] = min(0, min over edges (b, c) of dist[b] + w),
+    and the layer is -dist[c]. H is a DAG, so one sweep in topological order
+    settles every node; no auxiliary node or edges are built.
+
+    Parameters:
+        H (ArrayGraph): Condensation of G_minus, node ids = SCC ids
+        order (Iterable[int]): Topological order of the SCC ids
+
+    Returns:
+        List[int]: Layer index per SCC id
+    """
+    offsets = H.offsets.tolist()
+    targets = H.targets.tolist()
+    weights = H.weights.tolist()
+    dist = [0] * H.n
+    for c in order:
+        dc = dist[c]
+        for e in range(offsets[c], offsets[c + 1]):
+            if dc + weights[e] < dist[targets[e]]:
+                dist[targets[e]] = dc + weights[e]
+    return [-d for d in dist]
+
+class _ReducedLengthState:
+    """
+    Reduced edge lengths kept up to date across rounding iterations.
+
+    Holds the current duals, the reduced length of every edge, the set of
+    negative edges and the G_minus adjacency (edges with reduced length <= 0).
+    Changing the duals of some nodes only touches their incident edges.
+    """
+
+    def __init__(self, ag: ArrayGraph, y: np.ndarray):
+        self.ag = ag
+        self.y = y
+        self.red = _reduced_lengths_array(ag, y)
+        self.neg = set(np.flatnonzero(self.red < 0).tolist())
+        self.minus_out = [set() for _ in range(ag.n)] # node id -> G_minus out-edge ids
+        for e in np.flatnonzero(self.red <= 0).tolist():
+            self.minus_out[ag.sources[e]].add(e)
+        self.comp = None # SCC id per node at the last condense()
+        self.n_comps = 0
+        self.minus_changed = set() # G_minus edges added or removed since then
+
+    def decrement(self, nodes: np.ndarray, amount=1):
+        """Lower the duals of ``nodes`` by ``amount`` and refresh their incident edges."""
+        ag = self.ag
+        if len(nodes) == 0:
+            return
+        self.y[nodes] -= amount
+        edges = np.unique(np.concatenate([ag.out_edge_ids(nodes), ag.in_edge_ids(nodes)]))
+        old = self.red[edges]
+        new = ag.weights[edges] + self.y[ag.sources[edges]] - self.y[ag.targets[edges]]
+        self.red[edges] = new
+
+        flipped_neg = edges[(old < 0) != (new < 0)]
+        if flipped_neg.size:
+            for e in flipped_neg.tolist():
+                if e in self.neg:
+                    self.neg.remove(e)
+                else:
+                    self.neg.add(e)
+        flipped_minus = edges[(old <= 0) != (new <= 0)].tolist()
+        self.minus_changed.symmetric_difference_update(flipped_minus)
+        for e in flipped_minus:
+            out = self.minus_out[ag.sources[e]]
+            if e in out:
+                out.remove(e)
+            else:
+                out.add(e)
+
+    def safe_decrement(self, nodes: np.ndarray):
+        """
+        Largest step the duals of ``nodes`` can be lowered by in one go.
+
+        Lowering the set S shrinks the reduced length of edges leaving S and
+        grows it for edges entering S. The step stops at the first event:
+        an edge leaving S reaches 0 (enters G_minus) or turns negative, or a
+        negative edge entering S reaches 0, or an edge entering S leaves
+        G_minus. Never less than 1, and rounded down to a whole step.
+        """
+        ag = self.ag
+        in_set = np.zeros(ag.n, dtype=bool)
+        in_set[nodes] = True
+        out = ag.out_edge_ids(nodes)
+        out = out[~in_set[ag.targets[out]]]
+        inn = ag.in_edge_ids(nodes)
+        inn = inn[~in_set[ag.sources[inn]]]
+        r_out = self.red[out]
+        r_in = self.red[inn]
+        events = np.concatenate([
+            np.where(r_out > 0, r_out, 1)[r_out >= 0], # enters G_minus / turns negative
+            np.where(r_in < 0, -r_in, 1)[r_in <= 0],   # stops being negative / leaves G_minus
+        ])
+        if events.size == 0:
+            return 1
+        return max(1, int(np.floor(events.min())))
+
+    def minus_edges(self) -> np.ndarray:
+        """Edge ids of G_minus, in no particular order."""
+        return np.fromiter((e for out in self.minus_out for e in out), dtype=np.int64)
+
+    def condense(self):
+        """
+        SCCs of G_minus, its condensation H (node ids = SCC ids) and a topological order of H.
+
+        The first call runs Tarjan on all of G_minus. Later calls start from
+        the previous SCCs and only look at what the G_minus edges added or
+        removed since then can change: an SCC that lost an inner edge is
+        re-split on its own, and SCCs are merged only among those reachable
+        from the head and reaching the tail of an added edge between SCCs.
+        SCC ids are therefore not in topological order; use the returned order.
+        """
+        ag = self.ag
+        src, dst = ag.sources, ag.targets
+        edges = self.minus_edges()
+        if self.comp is None:
+            comp, n_comps = tarjan_scc_adjacency([[dst[e] for e in out] for out in self.minus_out])
+        else:
+            comp, n_comps = self._update_sccs(edges)
+        H = _condensation(n_comps, comp[src[edges]], comp[dst[edges]], self.red[edges])
+        self.comp, self.n_comps = comp, n_comps
+        self.minus_changed = set()
+        return H, comp, n_comps, _topological_order(H)
+
+    def _update_sccs(self, edges: np.ndarray) -> Tuple[np.ndarray, int]:
+        ag = self.ag
+        src, dst = ag.sources, ag.targets
+        comp = self.comp.astype(np.int64)
+        n_comps = self.n_comps
+        changed = np.fromiter(self.minus_changed, dtype=np.int64, count=len(self.minus_changed))
+        now_in = self.red[changed] <= 0
+        added, removed = changed[now_in], changed[~now_in]
+
+        # Removing an edge inside an SCC may split it
+        inner = removed[comp[src[removed]] == comp[dst[removed]]]
+        if inner.size:
+            members = np.flatnonzero(np.isin(comp, np.unique(comp[src[inner]])))
+            same = comp[src[edges]] == comp[dst[edges]]
+            sub, n_sub = _tarjan_on(members, src[edges[same]], dst[edges[same]], ag.n)
+            comp[members] = n_comps + sub
+            n_comps += n_sub
+
+        # Adding an edge between SCCs may merge the SCCs on a cycle through it
+        cross = added[comp[src[added]] != comp[dst[added]]]
+        if cross.size:
+            Q = _condensation(n_comps, comp[src[edges]], comp[dst[edges]], self.red[edges])
+            cand = np.flatnonzero(_reach(Q, comp[dst[cross]]) & _reach(Q, comp[src[cross]], forward=False))
+            if cand.size:
+                sub, n_sub = _tarjan_on(cand, Q.sources, Q.targets, n_comps)
+                remap = np.arange(n_comps)
+                remap[cand] = n_comps + sub
+                comp = remap[comp]
+                n_comps += n_sub
+
+        # Renumber the surviving ids to 0..n_comps-1
+        used, comp = np.unique(comp, return_inverse=True)
+        return comp.astype(np.int32), int(used.size)
+
+def _report(timer, stats, callback, profiler, run, iter_count):
+    # Hand one finished iteration to the callback and/or the active profiler
+    if callback is not None:
+        stats.phase_ns = timer.ns
+        callback(stats)
+    if profiler is not None:
+        profiler.record(run, iter_count, timer)
+
+def round_re_duals(G, y_pred, callback: Optional[Callable[[IterationStats], None]] = None,
+                   decrement: str = "unit"):
+    """
+    Round predicted duals into feasible ones (RPfRELD loop).
+
+    Progress goes to the ``utils.rounding`` logger: one compact line per
+    iteration at DEBUG, full dumps of duals, reduced lengths and SCCs at
+    TRACE. With logging above DEBUG and no callback nothing is formatted.
+    Phases are timed only when a callback is given or the call runs inside
+    ``utils.profiling.profile_rounding``.
+
+    Parameters:
+        G (nx.DiGraph | ArrayGraph): Graph with edge weights
+        y_pred (dict): Predicted dual of every node
+        callback (callable): Optional, called with an IterationStats after every
+            iteration (e.g. a utils.tracing.RoundingTrace)
+        decrement (str): "unit" lowers the selected duals by 1 per iteration;
+            "bulk" lowers them by the largest step that keeps G_minus and the
+            negative edge set unchanged, so the iteration count follows
+            structural changes instead of weight magnitudes
+
+    Returns:
+        y (dict): Rounded duals
+
+    Raises:
+        ValueError: On a negative cycle.
+        RuntimeError: If the loop hits its iteration limit with negative edges left
+            (large weights with decrement="unit"; try "bulk" or round_re_duals_scaled).
+    """
+    if decrement not in ("unit", "bulk"):
+        raise ValueError(f"Unknown decrement mode {decrement!r}, expected 'unit' or 'bulk'")
+    ag = as_array_graph(G) # Built once, every phase below works on the edge arrays
+    y, _ = _round_re_duals_arrays(ag, ag.to_array(y_pred), callback, decrement)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final duals y: %s", ag.to_dict(y))
+    return ag.to_dict(y)
+
+def _round_re_duals_arrays(ag: ArrayGraph, y: np.ndarray, callback=None, decrement: str = "unit"):
+    """
+    Rounding loop on arrays: ``y`` holds the duals by node id and is updated in place.
+
+    Returns:
+        y (np.ndarray): Rounded duals by node id
+        n_updates (int): Number of dual updates performed
+
+    Raises:
+        ValueError: On a negative cycle.
+        RuntimeError: If negative edges are left after max_iters iterations.
+    """
+    profiler = active_profiler()
+    timed = callback is not None or profiler is not None
+    timer = PhaseTimer() if timed else None
+    run = profiler.start_run() if profiler is not None else 0
+
+    state = _ReducedLengthState(ag, y)
+    labels = ag.nodes
+    n_updates = 0
     max_iters = 10000
+    debug = logger.isEnabledFor(logging.DEBUG)
+    trace = logger.isEnabledFor(TRACE)
+    if timed:
+        timer.lap('setup')
+        if profiler is not None:
+            profiler.record(run, 0, timer)
 
     for iter_count in range(1, max_iters + 1):
-        print(f"\n=== Iteration {iter_count} ===")
-        red_lens = reduced_edge_lengths(G, y)
-        neg_edges = [(u, v) for (u, v), l in red_lens.items() if l < 0]
-        print(f"Current duals y: {y}")
-        print(f"Reduced edge lengths: {red_lens}")
-        print(f"Negative edges: {neg_edges}")
-
-        if not neg_edges:
-            print("No negative edges... breaking the while.")
-            break
+        timer = PhaseTimer() if timed else None
+        stats = IterationStats(iter_count, len(state.neg)) if callback is not None else None
+        if trace:
+            logger.log(TRACE, "Iteration %d: duals y: %s", iter_count, ag.to_dict(state.y))
+            logger.log(TRACE, "Iteration %d: reduced edge lengths: %s", iter_count,
+                       dict(zip(ag.edge_labels(), state.red.tolist())))
+            logger.log(TRACE, "Iteration %d: negative edges: %s", iter_count,
+                       [(labels[ag.sources[e]], labels[ag.targets[e]]) for e in sorted(state.neg)])
 
-        G_minus = build_G_minus(G, y)
-        H, mapping, sccs = contract_scc(G_minus)
-        print(f"SCCs: {sccs}")
-        print(f"SCC mapping: {mapping}")
-        x = 'X_aux'
-        H.add_node(x)
-        for i in range(len(sccs)):
-            H.add_edge(x, i, weight=0)
+        if not state.neg:
+            logger.debug("Iteration %d: no negative edges, stopping", iter_count)
+            if timed:
+                _report(timer, stats, callback, profiler, run, iter_count)
+            break
 
-        try:
-            dists = nx.single_source_bellman_ford_path_length(H, x, weight='weight')
-        except nx.NetworkXUnbounded:
-            raise ValueError("Negative cycle detected in contracted graph during RPfRELD")
+        H, comp, n_comps, order = state.condense()
+        sccs = [[] for _ in range(n_comps)]
+        for v, c in enumerate(comp.tolist()):
+            sccs[c].append(v)
+        if trace:
+            logger.log(TRACE, "Iteration %d: SCCs: %s", iter_count, [{labels[v] for v in scc} for scc in sccs])
+            logger.log(TRACE, "Iteration %d: SCC mapping: %s", iter_count, ag.to_dict(comp))
+        if timed: timer.lap('condense')
 
         layers = defaultdict(list)
-        for i_scc, dist in dists.items():
-            if i_scc == x:
-                continue
-            i = -dist
+        for i_scc, i in enumerate(_dag_layers(H, order)):
             layers[i].append(i_scc)
-        
-        # Debug print for layers
-        print("Layer assignments:")
-        for i, scc_list in layers.items():
-            print(f"  Layer {i}: SCCs {scc_list}")
+        if timed: timer.lap('layers')
+
+        if trace:
+            for i, scc_list in layers.items():
+                logger.log(TRACE, "Iteration %d: layer %s: SCCs %s", iter_count, i, scc_list)
 
         if not layers:
-            print("No layers found... breaking.")
+            logger.debug("Iteration %d: no layers found, stopping", iter_count)
+            if timed:
+                if stats is not None:
+                    stats.n_sccs = n_comps
+                _report(timer, stats, callback, profiler, run, iter_count)
             break
 
-        i_star = max(layers, key=lambda k: len(layers[k]))
-        print(f"i_star = {i_star}, layer with most SCCs: {layers[i_star]}")
+        # Layer 0 holds every SCC without an incoming negative path; selecting it
+        # would lower all duals together and leave every reduced length as is
+        positive = [k for k in layers if k > 0]
+        if not positive:
+            # Every negative edge lies inside an SCC of G_minus, i.e. on a negative cycle
+            raise ValueError("Negative cycle detected in G_minus during RPfRELD")
+        i_star = max(sorted(positive), key=lambda k: len(layers[k])) # ties: lowest layer, whatever the SCC numbering
 
         selected_sccs = set()
         for t in layers:
             if t >= i_star:
                 selected_sccs.update(layers[t])
 
-        print(f"Selected SCCs to decrement: {selected_sccs}")
         nodes_to_decrement = []
         for idx, scc in enumerate(sccs):
             if idx in selected_sccs:
-                print(f"  Decrementing duals for nodes: {list(scc)}")
-                nodes_to_decrement.extend(list(scc))
+                nodes_to_decrement.extend(scc)
 
         # # --------- PATCHED SECTION: only decrement one endpoint for each negative edge ---------
         # actually_decrement = set(nodes_to_decrement)
@@ -106,26 +409,222 @@ def round_re_duals(G, y_pred):
         # print(f"Final nodes to decrement this iteration: {actually_decrement}")
 
         actually_decrement = set(nodes_to_decrement)
-        print(f"Final nodes to decrement this iteration: {actually_decrement}")
+        to_decrement = np.fromiter(actually_decrement, dtype=np.int64, count=len(actually_decrement))
+        step = state.safe_decrement(to_decrement) if decrement == "bulk" else 1
+        if trace:
+            logger.log(TRACE, "Iteration %d: selected SCCs %s, nodes to decrement %s", iter_count,
+                       selected_sccs, {labels[v] for v in actually_decrement})
+        if debug:
+            logger.debug("Iteration %d: %d negative edges, %d SCCs, i_star=%s (%d SCCs), %d nodes decremented by %s",
+                         iter_count, len(state.neg), n_comps, i_star, len(layers[i_star]), len(actually_decrement), step)
 
+        if timed: timer.lap('select')
 
-        # Defensive check: count repeated selection
-        if (neg_edges == last_neg_edges) and (selected_sccs == last_selected_sccs):
-            same_count += 1
-            print(f"Loop detected: negative edges and selected SCCs unchanged ({same_count} times).")
-            if same_count >= max_iters:
-                print(f"No progress after {max_iters} repeated iterations. Breaking loop.")
-                break
-        else:
-            same_count = 0
-        last_neg_edges = neg_edges.copy()
-        last_selected_sccs = selected_sccs.copy()
+        # Update duals, only the edges incident to these nodes change
+        state.decrement(to_decrement, step)
+        n_updates += 1
+
+        if timed:
+            timer.lap('update')
+            if stats is not None:
+                stats.n_sccs = n_comps
+                stats.i_star = i_star
+                stats.n_decremented = len(actually_decrement)
+                stats.step = step
+            _report(timer, stats, callback, profiler, run, iter_count)
+    else:
+        raise RuntimeError(f"RPfRELD did not converge within {max_iters} iterations "
+                           f"({len(state.neg)} negative edges left)")
+
+    return state.y, n_updates
+
+def round_re_duals_scaled(G, y_pred, decrement: str = "unit"):
+    """
+    Bit-scaling (Goldberg) driver around the rounding loop.
+
+    Works on the reduced lengths r = w + y_pred[u] - y_pred[v]. With W the
+    largest negative reduced length and k = bits(W), it first solves on
+    ceil(r / 2^k) (trivially feasible), then for each lower bit doubles the
+    correction and refines it on ceil(r / 2^i). After doubling every reduced
+    length is >= -1, so each level only has to fix unit violations and the
+    total work grows with log W instead of W.
+
+    Parameters:
+        G (nx.DiGraph | ArrayGraph): Graph with integer edge weights
+        y_pred (dict): Integer predicted dual of every node
+        decrement (str): Decrement mode of the inner loop, see round_re_duals
+
+    Returns:
+        y (dict): Rounded duals
+
+    Raises:
+        ValueError: If weights or predictions are not integers, or on a negative cycle.
+        RuntimeError: If a level hits the iteration limit, see round_re_duals.
+    """
+    if decrement not in ("unit", "bulk"):
+        raise ValueError(f"Unknown decrement mode {decrement!r}, expected 'unit' or 'bulk'")
+    ag = as_array_graph(G)
+    y0 = ag.to_array(y_pred)
+    if not (_is_integral(ag.weights) and _is_integral(y0)):
+        raise ValueError("Scaling requires integer weights and predictions")
+    red = _reduced_lengths_array(ag, y0.astype(np.int64)).astype(np.int64)
+
+    W = int(max(0, -red.min())) if red.size else 0
+    z = np.zeros(ag.n, dtype=np.int64)
+    for i in range(W.bit_length(), -1, -1):
+        z *= 2
+        level = ag.with_weights(-((-red) >> i)) # ceil(red / 2^i)
+        z, n_updates = _round_re_duals_arrays(level, z, decrement=decrement)
+        logger.debug("Scaling level %d: %d dual updates", i, n_updates)
+
+    return ag.to_dict(y0 + z)
+
+def _is_integral(values: np.ndarray) -> bool:
+    if np.issubdtype(values.dtype, np.integer):
+        return True
+    return bool(np.all(np.isfinite(values)) and np.all(values == np.round(values)))
+
+# Per-process state of the round_re_duals_batch workers
+_batch_graph = None
+_batch_decrement = "unit"
+
+def _batch_worker_init(ag: ArrayGraph, decrement: str):
+    global _batch_graph, _batch_decrement
+    _batch_graph = ag
+    _batch_decrement = decrement
+
+def _batch_worker(y_row: np.ndarray):
+    return _round_re_duals_arrays(_batch_graph, y_row, decrement=_batch_decrement)
+
+def round_re_duals_batch(G, Y_pred, decrement: str = "unit", processes: Optional[int] = None,
+                         chunk_bytes: int = 64 * 2**20) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Round many predicted dual vectors against the same graph.
 
-        # Update duals
-        for v in actually_decrement:
-            y[v] -= 1
+    The edge arrays are built once. Reduced lengths of all samples are
+    computed together (in row chunks of about ``chunk_bytes``) and samples
+    that are already feasible are returned untouched; the rest go through
+    the rounding loop, across a process pool when ``processes`` > 1.
 
-    print(f"\nFinal duals y: {y}")
+    Parameters:
+        G (nx.DiGraph | ArrayGraph): Graph with edge weights
+        Y_pred (array-like): Predictions, shape (samples, nodes); columns follow
+            the graph's node order (``G.nodes``)
+        decrement (str): Decrement mode, see round_re_duals
+        processes (int): Worker processes for the non-vectorizable part; None or 1 runs in-process
+        chunk_bytes (int): Memory budget of one block of batched reduced lengths
+
+    Returns:
+        Y (np.ndarray): Rounded duals, same shape as Y_pred
+        iterations (np.ndarray): Number of dual updates per sample
+
+    Raises:
+        ValueError: On a shape mismatch or a negative cycle.
+        RuntimeError: If some sample hits the iteration limit, see round_re_duals.
+    """
+    if decrement not in ("unit", "bulk"):
+        raise ValueError(f"Unknown decrement mode {decrement!r}, expected 'unit' or 'bulk'")
+    ag = as_array_graph(G)
+    Y = np.array(Y_pred)
+    if Y.ndim != 2 or Y.shape[1] != ag.n:
+        raise ValueError(f"Y_pred must have shape (samples, {ag.n}), got {Y.shape}")
+    iterations = np.zeros(Y.shape[0], dtype=np.int64)
+
+    # Vectorized feasibility screen over all samples
+    pending = []
+    rows = max(1, chunk_bytes // max(1, 8 * ag.m))
+    for start in range(0, Y.shape[0], rows):
+        block = Y[start:start + rows]
+        red = ag.weights[None, :] + block[:, ag.sources] - block[:, ag.targets]
+        pending.extend((start + np.flatnonzero((red < 0).any(axis=1))).tolist())
+    logger.debug("Batch of %d samples: %d need rounding", Y.shape[0], len(pending))
+
+    if processes is not None and processes > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(processes, initializer=_batch_worker_init, initargs=(ag, decrement)) as pool:
+            results = pool.map(_batch_worker, [Y[i] for i in pending])
+            for i in pending:
+                try:
+                    Y[i], iterations[i] = next(results)
+                except RuntimeError as e:
+                    raise RuntimeError(f"Sample {i}: {e}") from None
+    else:
+        for i in pending:
+            try:
+                Y[i], iterations[i] = _round_re_duals_arrays(ag, Y[i].copy(), decrement=decrement)
+            except RuntimeError as e:
+                raise RuntimeError(f"Sample {i}: {e}") from None
+
+    return Y, iterations
+
+def repair_duals(G, y_prev, changed_edges, weight: str = 'weight'):
+    """
+    Restore feasibility of previous duals after a few edge weights changed.
+
+    ``G`` is the graph after the update and ``y_prev`` were feasible before
+    it, so only the changed (or inserted) edges can have a negative reduced
+    length. The repair computes d[v] = min(0, shortest reduced-length path
+    into v that starts with one of those edges) with a heap-ordered
+    label-correcting search seeded from them, and returns y_prev + d: the
+    largest feasible duals below y_prev. Only nodes downstream of a violated
+    edge are visited, so the cost follows the size of the change.
+
+    Parameters:
+        G (nx.DiGraph | ArrayGraph): Updated graph with edge weights
+        y_prev (dict): Duals that were feasible before the update
+        changed_edges (Iterable[tuple]): (u, v) edges whose weight changed or that were inserted
+        weight (str): Edge attribute holding the weight (networkx input only)
+
+    Returns:
+        y (dict): Repaired duals (a new dict, y_prev is left untouched)
+
+    Raises:
+        ValueError: If the update created a negative cycle.
+    """
+    if isinstance(G, ArrayGraph):
+        labels, index = G.nodes, G.index
+        def successors(u):
+            sl = G.out_edges(index[u])
+            return zip([labels[t] for t in G.targets[sl].tolist()], G.weights[sl].tolist())
+    else:
+        def successors(u):
+            return ((v, data.get(weight, 1)) for v, data in G.adj[u].items())
+
+    y = y_prev
+    # Seeds: changed edges with a negative reduced length
+    changed = set(changed_edges)
+    d = {}
+    floor = 0 # a simple path uses each violated edge at most once, so no label goes below their sum
+    n_violated = 0
+    for u in {u for u, _ in changed}:
+        for v, w in successors(u):
+            r = w + y[u] - y[v]
+            if r < 0 and (u, v) in changed:
+                n_violated += 1
+                floor += r
+                if r < d.get(v, 0):
+                    d[v] = r
+    heap = [(dv, v) for v, dv in d.items()]
+    heapq.heapify(heap)
+
+    pops = 0
+    while heap:
+        dv, v = heapq.heappop(heap)
+        if dv > d[v]:
+            continue # stale entry
+        pops += 1
+        yv = y[v]
+        for x, w in successors(v):
+            cand = dv + w + yv - y[x]
+            if cand < d.get(x, 0):
+                if cand < floor:
+                    raise ValueError("Edge update created a negative cycle, duals cannot be repaired")
+                d[x] = cand
+                heapq.heappush(heap, (cand, x))
+
+    logger.debug("Repair: %d violated edges, %d nodes lowered, %d scans", n_violated, len(d), pops)
+    y = dict(y_prev)
+    for v, dv in d.items():
+        y[v] += dv
     return y
 
 def reduced_edge_lengths_after(G, y):
@@ -135,32 +634,37 @@ def reduced_edge_lengths_after(G, y):
         print(f"  Edge {edge}: reduced length = {val}")
 
 
-def RPfRELD_experiment_version(G: nx.DiGraph, weights: Dict[tuple, float], y_hat: Dict[int, float]) -> Dict[int, float]:
+def RPfRELD_experiment_version(G, weights: Dict[tuple, float], y_hat: Dict[int, float]) -> Dict[int, float]:
     """
-    Experimental Bellman-based version for Rounding Predictions for Reduced Edge Length Duals
+    Exact feasible duals closest to the prediction from below (reference oracle).
+
+    Shortest paths under the reduced lengths r_uv = w_uv + y_hat[u] - y_hat[v]
+    from a virtual super-source with 0-weight edges to every node give
+    d[v] <= 0, and y_bar = y_hat + d are the largest feasible duals below
+    y_hat: every node gets a finite dual, reachable from any particular node
+    or not. The super-source is implicit (see
+    algorithms.bellman_ford.super_source_potentials) and the residual graph
+    is just a new weight array on the same structure.
 
     Args:
-        G (nx.DiGraph): Graph with nodes and directed edges.
-        weights (dict): Dictionary mapping edges (u, v) to weights w_uv.
+        G (nx.DiGraph | ArrayGraph): Graph with nodes and directed edges.
+        weights (dict): Optional overrides mapping edges (u, v) to weights w_uv.
         y_hat (dict): Predicted node potentials.
 
     Returns:
         y_bar (dict): Rounded potentials satisfying: w_uv + y_bar[u] - y_bar[v] >= 0 for all (u,v)
-    """
-    residual_graph = nx.DiGraph()
-    for u, v in G.edges():
-        w_uv = weights.get((u, v), G[u][v].get('weight', 1))
-        reduced_len = w_uv + y_hat[u] - y_hat[v]
-        residual_graph.add_edge(u, v, weight=reduced_len)
-
-    source = 0 if 0 in G else list(G.nodes())[0]
 
+    Raises:
+        NegativeCycleError: (a ValueError) if G has a negative-weight cycle, no feasible duals exist.
+    """
+    ag = as_array_graph(G)
+    w = ag.weights
+    if weights:
+        w = np.array([weights.get(edge, wt) for edge, wt in zip(ag.edge_labels(), w.tolist())])
+    y = ag.to_array(y_hat)
+    residual = ag.with_weights(w + y[ag.sources] - y[ag.targets])
     try:
-        delta = nx.single_source_bellman_ford_path_length(residual_graph, source)
-    except nx.NetworkXUnbounded:
-        raise ValueError("Residual graph has a negative-weight cycle — invalid y_hat prediction")
-
-    delta = {v: delta.get(v, float('inf')) for v in G.nodes()}
-
-    y_bar = {v: y_hat[v] + delta[v] for v in G.nodes()}
-    return y_bar
+        delta, _ = _super_source_arrays(residual)
+    except NegativeCycleError as e:
+        raise NegativeCycleError("Residual graph has a negative-weight cycle, no feasible duals exist", e.cycle) from None
+    return ag.to_dict(y + delta)
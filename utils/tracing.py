@@ -0,0 +1,69 @@
+# utils/tracing.py
+
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+# Finer than DEBUG: full per-iteration dumps of duals, reduced lengths and SCCs
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+
+@dataclass
+class IterationStats:
+    """
+    Compact per-iteration record of the rounding loop.
+
+    Attributes:
+        iteration (int): 1-based iteration number
+        n_negative_edges (int): Edges with negative reduced length at the start of the iteration
+        n_sccs (int): Number of SCCs of G_minus (0 if the loop stopped before contracting)
+        i_star (Optional[float]): Selected layer, None if no layer was selected
+        n_decremented (int): Number of nodes whose dual was lowered
+        step (int): Amount the selected duals were lowered by
+        phase_ns (Dict[str, int]): Wall time per phase in nanoseconds
+    """
+    iteration: int
+    n_negative_edges: int
+    n_sccs: int = 0
+    i_star: Optional[float] = None
+    n_decremented: int = 0
+    step: int = 0
+    phase_ns: Dict[str, int] = field(default_factory=dict)
+
+
+class RoundingTrace:
+    """
+    Callback for ``round_re_duals`` that keeps every IterationStats it receives.
+
+    Usage:
+        trace = RoundingTrace()
+        round_re_duals(G, y_pred, callback=trace)
+        trace.iterations[-1].n_negative_edges
+    """
+
+    def __init__(self):
+        self.iterations: List[IterationStats] = []
+
+    def __call__(self, stats: IterationStats):
+        self.iterations.append(stats)
+
+    def __len__(self):
+        return len(self.iterations)
+
+    def total_phase_ns(self) -> Dict[str, int]:
+        """Wall time per phase summed over all iterations."""
+        totals: Dict[str, int] = {}
+        for stats in self.iterations:
+            for phase, ns in stats.phase_ns.items():
+                totals[phase] = totals.get(phase, 0) + ns
+        return totals
+
+    def to_rows(self) -> List[dict]:
+        """One flat dict per iteration (phase times as ``<phase>_ns`` columns)."""
+        rows = []
+        for stats in self.iterations:
+            row = asdict(stats)
+            row.update({f"{phase}_ns": ns for phase, ns in row.pop('phase_ns').items()})
+            rows.append(row)
+        return rows